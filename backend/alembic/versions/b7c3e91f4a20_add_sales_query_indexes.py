@@ -0,0 +1,44 @@
+"""add sales query indexes
+
+Revision ID: b7c3e91f4a20
+Revises: 58ba57059975
+Create Date: 2026-10-17 10:12:04.318207
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7c3e91f4a20'
+down_revision: Union[str, Sequence[str], None] = '58ba57059975'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY can't run inside a transaction, and avoids locking writes on large tables
+    with op.get_context().autocommit_block():
+        op.create_index('ix_daily_sales_items_report_id', 'daily_sales_items', ['report_id'], unique=False, postgresql_concurrently=True)
+        op.create_index('ix_daily_sales_items_product_id', 'daily_sales_items', ['product_id'], unique=False, postgresql_concurrently=True)
+        op.create_index('ix_daily_sales_report_date_id', 'daily_sales_report', ['report_date', 'id'], unique=False, postgresql_concurrently=True)
+        op.create_index('ix_daily_sales_report_partner_date_id', 'daily_sales_report', ['retail_partner_id', 'report_date', 'id'], unique=False, postgresql_concurrently=True)
+        op.create_index('ix_daily_sales_report_status_date_id', 'daily_sales_report', ['status', 'report_date', 'id'], unique=False, postgresql_concurrently=True)
+        op.create_index(
+            'ix_daily_sales_report_pending_date_id', 'daily_sales_report', ['report_date', 'id'], unique=False,
+            postgresql_where=sa.text("status = 'pending'"), postgresql_concurrently=True
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_daily_sales_report_pending_date_id', table_name='daily_sales_report', postgresql_concurrently=True)
+        op.drop_index('ix_daily_sales_report_status_date_id', table_name='daily_sales_report', postgresql_concurrently=True)
+        op.drop_index('ix_daily_sales_report_partner_date_id', table_name='daily_sales_report', postgresql_concurrently=True)
+        op.drop_index('ix_daily_sales_report_date_id', table_name='daily_sales_report', postgresql_concurrently=True)
+        op.drop_index('ix_daily_sales_items_product_id', table_name='daily_sales_items', postgresql_concurrently=True)
+        op.drop_index('ix_daily_sales_items_report_id', table_name='daily_sales_items', postgresql_concurrently=True)
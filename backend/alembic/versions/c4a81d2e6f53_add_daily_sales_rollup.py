@@ -0,0 +1,50 @@
+"""add daily sales rollup
+
+Revision ID: c4a81d2e6f53
+Revises: b7c3e91f4a20
+Create Date: 2026-10-17 11:03:41.902115
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4a81d2e6f53'
+down_revision: Union[str, Sequence[str], None] = 'b7c3e91f4a20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('daily_sales_rollup',
+    sa.Column('report_date', sa.Date(), nullable=False),
+    sa.Column('retail_partner_id', sa.Integer(), nullable=False),
+    sa.Column('product_id', sa.Integer(), nullable=False),
+    sa.Column('quantity', sa.Integer(), nullable=False),
+    sa.Column('gross_value', sa.Numeric(precision=14, scale=2), nullable=False),
+    sa.Column('net_value', sa.Numeric(precision=14, scale=2), nullable=False),
+    sa.ForeignKeyConstraint(['product_id'], ['products.id'], ),
+    sa.ForeignKeyConstraint(['retail_partner_id'], ['retail_partners.id'], ),
+    sa.PrimaryKeyConstraint('report_date', 'retail_partner_id', 'product_id')
+    )
+    # Backfill from reports that already count towards the rollup
+    op.execute("""
+        INSERT INTO daily_sales_rollup (report_date, retail_partner_id, product_id, quantity, gross_value, net_value)
+        SELECT r.report_date, r.retail_partner_id, i.product_id,
+               SUM(i.quantity_sold),
+               SUM(i.quantity_sold * i.unit_price),
+               SUM(ROUND(i.quantity_sold * i.unit_price * (100 - COALESCE(i.discount_percent, 0)) / 100, 2))
+        FROM daily_sales_report r
+        JOIN daily_sales_items i ON i.report_id = r.id
+        WHERE r.status = 'approved'
+        GROUP BY r.report_date, r.retail_partner_id, i.product_id
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('daily_sales_rollup')
@@ -0,0 +1,174 @@
+"""partition sales tables by month
+
+Revision ID: e5b2d7f90a13
+Revises: c4a81d2e6f53
+Create Date: 2026-10-17 15:22:09.518274
+
+"""
+from datetime import date
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5b2d7f90a13'
+down_revision: Union[str, Sequence[str], None] = 'c4a81d2e6f53'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Months after the current one to create partitions for; later ones come from scripts.create_partitions
+MONTHS_AHEAD = 3
+
+REPORT_COLUMNS = "id, merchandiser_id, retail_partner_id, report_date, status, notes, submitted_at"
+ITEM_COLUMNS = "id, report_id, product_id, quantity_sold, unit_price, discount_percent"
+
+
+def _add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _report_columns():
+    return [
+        sa.Column('id', sa.Integer(), server_default=sa.text("nextval('daily_sales_report_id_seq'::regclass)"), nullable=False),
+        sa.Column('merchandiser_id', sa.Integer(), nullable=False),
+        sa.Column('retail_partner_id', sa.Integer(), nullable=False),
+        sa.Column('report_date', sa.Date(), nullable=False),
+        sa.Column('status', sa.String(length=50), nullable=True),
+        sa.Column('notes', sa.Text(), nullable=True),
+        sa.Column('submitted_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['merchandiser_id'], ['users.id'], name='daily_sales_report_merchandiser_id_fkey'),
+        sa.ForeignKeyConstraint(['retail_partner_id'], ['retail_partners.id'], name='daily_sales_report_retail_partner_id_fkey'),
+        sa.CheckConstraint("status IN ('submitted', 'pending', 'approved', 'rejected')", name='daily_sales_report_status_check'),
+    ]
+
+
+def _item_columns():
+    return [
+        sa.Column('id', sa.Integer(), server_default=sa.text("nextval('daily_sales_items_id_seq'::regclass)"), nullable=False),
+        sa.Column('report_id', sa.Integer(), nullable=False),
+        sa.Column('product_id', sa.Integer(), nullable=False),
+        sa.Column('quantity_sold', sa.Integer(), nullable=False),
+        sa.Column('unit_price', sa.Numeric(precision=10, scale=2), nullable=False),
+        sa.Column('discount_percent', sa.Numeric(precision=5, scale=2), nullable=True),
+        sa.ForeignKeyConstraint(['product_id'], ['products.id'], name='daily_sales_items_product_id_fkey'),
+    ]
+
+
+def _create_indexes() -> None:
+    op.create_index('ix_daily_sales_items_report_id', 'daily_sales_items', ['report_id'], unique=False)
+    op.create_index('ix_daily_sales_items_product_id', 'daily_sales_items', ['product_id'], unique=False)
+    op.create_index('ix_daily_sales_report_date_id', 'daily_sales_report', ['report_date', 'id'], unique=False)
+    op.create_index('ix_daily_sales_report_partner_date_id', 'daily_sales_report', ['retail_partner_id', 'report_date', 'id'], unique=False)
+    op.create_index('ix_daily_sales_report_status_date_id', 'daily_sales_report', ['status', 'report_date', 'id'], unique=False)
+    op.create_index(
+        'ix_daily_sales_report_pending_date_id', 'daily_sales_report', ['report_date', 'id'], unique=False,
+        postgresql_where=sa.text("status = 'pending'")
+    )
+
+
+def _drop_indexes(suffix: str) -> None:
+    """Drops the indexes of the tables renamed with `suffix`, whose names are schema-wide."""
+    for name in (
+        'ix_daily_sales_items_report_id', 'ix_daily_sales_items_product_id',
+        'ix_daily_sales_report_date_id', 'ix_daily_sales_report_partner_date_id',
+        'ix_daily_sales_report_status_date_id', 'ix_daily_sales_report_pending_date_id',
+    ):
+        op.drop_index(name)
+    op.drop_constraint('uix_merch_report_date', 'daily_sales_report' + suffix, type_='unique')
+    op.drop_constraint('daily_sales_items_pkey', 'daily_sales_items' + suffix, type_='primary')
+    op.drop_constraint('daily_sales_report_pkey', 'daily_sales_report' + suffix, type_='primary')
+
+
+def _rename_tables(report_fkey: str, suffix: str) -> None:
+    op.drop_constraint(report_fkey, 'daily_sales_items', type_='foreignkey')
+    for table in ('daily_sales_report', 'daily_sales_items'):
+        # Keep the id sequences when the old tables are dropped
+        op.execute(f"ALTER SEQUENCE {table}_id_seq OWNED BY NONE")
+        op.rename_table(table, table + suffix)
+
+
+def _own_sequences() -> None:
+    for table in ('daily_sales_report', 'daily_sales_items'):
+        op.execute(f"ALTER SEQUENCE {table}_id_seq OWNED BY {table}.id")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    _rename_tables('daily_sales_items_report_id_fkey', '_old')
+    _drop_indexes('_old')
+
+    op.create_table('daily_sales_report',
+    *_report_columns(),
+    sa.PrimaryKeyConstraint('id', 'report_date', name='daily_sales_report_pkey'),
+    sa.UniqueConstraint('merchandiser_id', 'report_date', name='uix_merch_report_date'),
+    postgresql_partition_by='RANGE (report_date)'
+    )
+    op.create_table('daily_sales_items',
+    *_item_columns(),
+    sa.Column('report_date', sa.Date(), nullable=False),
+    sa.PrimaryKeyConstraint('id', 'report_date', name='daily_sales_items_pkey'),
+    postgresql_partition_by='RANGE (report_date)'
+    )
+    _own_sequences()
+
+    # One partition per month from the oldest report through MONTHS_AHEAD months from now
+    first, newest = op.get_bind().execute(sa.text(
+        "SELECT date_trunc('month', MIN(report_date))::date, date_trunc('month', MAX(report_date))::date FROM daily_sales_report_old"
+    )).one()
+    this_month = date.today().replace(day=1)
+    month = min(first or this_month, this_month)
+    last = max(newest or this_month, _add_months(this_month, MONTHS_AHEAD))
+    while month <= last:
+        bounds = f"FOR VALUES FROM ('{month.isoformat()}') TO ('{_add_months(month, 1).isoformat()}')"
+        for table in ('daily_sales_report', 'daily_sales_items'):
+            op.execute(f"CREATE TABLE {table}_y{month:%Y}m{month:%m} PARTITION OF {table} {bounds}")
+        month = _add_months(month, 1)
+    for table in ('daily_sales_report', 'daily_sales_items'):
+        op.execute(f"CREATE TABLE {table}_default PARTITION OF {table} DEFAULT")
+
+    op.execute(f"INSERT INTO daily_sales_report ({REPORT_COLUMNS}) SELECT {REPORT_COLUMNS} FROM daily_sales_report_old")
+    op.execute(f"""
+        INSERT INTO daily_sales_items ({ITEM_COLUMNS}, report_date)
+        SELECT {', '.join('i.' + column for column in ITEM_COLUMNS.split(', '))}, r.report_date
+        FROM daily_sales_items_old i
+        JOIN daily_sales_report_old r ON r.id = i.report_id
+    """)
+    op.drop_table('daily_sales_items_old')
+    op.drop_table('daily_sales_report_old')
+
+    _create_indexes()
+    op.create_foreign_key(
+        'daily_sales_items_report_fkey', 'daily_sales_items', 'daily_sales_report',
+        ['report_id', 'report_date'], ['id', 'report_date']
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _rename_tables('daily_sales_items_report_fkey', '_partitioned')
+    _drop_indexes('_partitioned')
+
+    op.create_table('daily_sales_report',
+    *_report_columns(),
+    sa.PrimaryKeyConstraint('id', name='daily_sales_report_pkey'),
+    sa.UniqueConstraint('merchandiser_id', 'report_date', name='uix_merch_report_date')
+    )
+    op.create_table('daily_sales_items',
+    *_item_columns(),
+    sa.PrimaryKeyConstraint('id', name='daily_sales_items_pkey')
+    )
+    _own_sequences()
+
+    op.execute(f"INSERT INTO daily_sales_report ({REPORT_COLUMNS}) SELECT {REPORT_COLUMNS} FROM daily_sales_report_partitioned")
+    op.execute(f"INSERT INTO daily_sales_items ({ITEM_COLUMNS}) SELECT {ITEM_COLUMNS} FROM daily_sales_items_partitioned")
+    # Dropping the parents drops their partitions
+    op.drop_table('daily_sales_items_partitioned')
+    op.drop_table('daily_sales_report_partitioned')
+
+    _create_indexes()
+    op.create_foreign_key(
+        'daily_sales_items_report_id_fkey', 'daily_sales_items', 'daily_sales_report', ['report_id'], ['id']
+    )
@@ -1,9 +1,10 @@
 from datetime import date
 from typing import List
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException
 import models
 from sqlalchemy.orm import Session, selectinload, joinedload
 from db.database import get_db
+from api import catalog_cache
 from pydantic import BaseModel
 
 router=APIRouter(prefix="/api",tags=["api"])
@@ -71,6 +72,7 @@ def create_retail_partners(newRetail:CreateRetail, db: Session = Depends(get_db)
     retailpartners=models.RetailPartner(name=newRetail.name, location=newRetail.location)
     db.add(retailpartners)
     db.commit()
+    catalog_cache.invalidate(catalog_cache.RETAIL_PARTNERS)
     db.refresh(retailpartners)
     return CreateRetail(name=retailpartners.name,location=retailpartners.location)
 
@@ -84,8 +86,7 @@ class ProductModel(BaseModel):
 
 @router.get("/products")
 def get_products(db:Session=Depends(get_db)):
-    all_products=db.query(models.Product).all()  
-    return all_products
+    return catalog_cache.cached_json_response(catalog_cache.PRODUCTS, "api:products", lambda: db.query(models.Product).all())
 
 
 @router.post("/products")
@@ -93,6 +94,7 @@ def create_products(product:ProductModel,db:Session=Depends(get_db)):
     new_products=models.Product(name=product.name, category=product.category, unit_cost_price=product.unit_cost_price, unit_price=product.unit_cost_price)  
     db.add(new_products)
     db.commit()
+    catalog_cache.invalidate(catalog_cache.PRODUCTS)
     db.refresh(new_products)
     return new_products
 
@@ -150,7 +152,11 @@ class CreateDailyItem(BaseModel):
 
 @router.post('/dailyitem')
 def create_daily_sales_item(dailyItem:CreateDailyItem, db:Session=Depends(get_db)):
-    new_daily_sales=models.DailySalesItem(report_id=dailyItem.report_id, product_id=dailyItem.product_id, quantity_sold=dailyItem.quantity_sold, unit_price=dailyItem.unit_price, discount_percent=dailyItem.discount_percent)
+    # Key-share lock: the report cannot be archived (see db/archive.py) before the item is committed
+    report=db.get(models.DailySalesReport, dailyItem.report_id, with_for_update={"key_share": True})
+    if report is None:
+        raise HTTPException(status_code=404, detail="Report not found")
+    new_daily_sales=models.DailySalesItem(report_id=report.id, report_date=report.report_date, product_id=dailyItem.product_id, quantity_sold=dailyItem.quantity_sold, unit_price=dailyItem.unit_price, discount_percent=dailyItem.discount_percent)
     db.add(new_daily_sales)
     db.commit()
     db.refresh(new_daily_sales)
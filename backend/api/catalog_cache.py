@@ -0,0 +1,130 @@
+"""
+Read-through cache for catalog responses (products, retail partners) and other
+rarely changing JSON such as closed-period leaderboards.
+
+Cached values are the serialized JSON bytes of a response, stored under
+versioned keys: `catalog:<namespace>:v<version>:<key>`. Writers call
+`invalidate(namespace)` after committing, which bumps the namespace version so
+every older entry becomes unreachable and expires on its own.
+
+By default the cache lives in process memory. Set CATALOG_CACHE_URL to a Redis
+URL to share entries and versions across worker processes (requires `redis`).
+"""
+import os
+import threading
+import time
+from typing import Callable, Optional
+
+from fastapi import Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+PRODUCTS = "products"
+RETAIL_PARTNERS = "retail_partners"
+LEADERBOARDS = "leaderboards"
+
+
+class MemoryBackend:
+    """Per-process backend. Versions are local, so other workers only see changes after the TTL."""
+    shared = False
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._values = {}
+        self._versions = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires < time.monotonic():
+                del self._values[key]
+                return None
+            return value
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        with self._lock:
+            if len(self._values) >= self.max_entries:
+                now = time.monotonic()
+                self._values = {k: v for k, v in self._values.items() if v[0] >= now}
+                if len(self._values) >= self.max_entries:
+                    self._values.pop(next(iter(self._values)))
+            self._values[key] = (time.monotonic() + ttl, value)
+
+    def version(self, namespace: str) -> int:
+        with self._lock:
+            return self._versions.get(namespace, 0)
+
+    def bump(self, namespace: str) -> None:
+        with self._lock:
+            self._versions[namespace] = self._versions.get(namespace, 0) + 1
+
+
+class RedisBackend:
+    """Shared backend; versions are Redis counters so every worker sees invalidations at once."""
+    shared = True
+
+    def __init__(self, url: str):
+        import redis  # optional dependency
+        self._redis = redis.Redis.from_url(url)
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self._redis.get(key)
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        self._redis.set(key, value, ex=max(int(ttl), 1))
+
+    def version(self, namespace: str) -> int:
+        return int(self._redis.get(f"catalog:{namespace}:version") or 0)
+
+    def bump(self, namespace: str) -> None:
+        self._redis.incr(f"catalog:{namespace}:version")
+
+
+class CatalogCache:
+    def __init__(self, backend, ttl: float):
+        self.backend = backend
+        self.ttl = ttl
+
+    def get_or_build(self, namespace: str, key: str, build: Callable[[], bytes], ttl: Optional[float] = None) -> bytes:
+        cache_key = f"catalog:{namespace}:v{self.backend.version(namespace)}:{key}"
+        value = self.backend.get(cache_key)
+        if value is None:
+            value = build()
+            self.backend.set(cache_key, value, self.ttl if ttl is None else ttl)
+        return value
+
+    def invalidate(self, namespace: str) -> None:
+        self.backend.bump(namespace)
+
+
+_cache_url = os.getenv("CATALOG_CACHE_URL")
+catalog_cache = CatalogCache(
+    backend=RedisBackend(_cache_url) if _cache_url else MemoryBackend(),
+    ttl=float(os.getenv("CATALOG_CACHE_TTL", "300")),
+)
+
+
+def cached_json_response(namespace: str, key: str, build: Callable[[], object], ttl: Optional[float] = None) -> Response:
+    """
+    Returns the cached JSON for `key`, calling `build` on a miss. `build` returns
+    what the endpoint would have returned (models, ORM rows, lists); it is encoded
+    exactly as FastAPI's default JSONResponse would encode it. `ttl` overrides
+    CATALOG_CACHE_TTL for this entry.
+    """
+    body = catalog_cache.get_or_build(namespace, key, lambda: JSONResponse(jsonable_encoder(build())).body, ttl)
+    return Response(content=body, media_type="application/json")
+
+
+def is_shared() -> bool:
+    """Whether invalidations reach every worker process, i.e. the cache is not per-process."""
+    return catalog_cache.backend.shared
+
+
+def invalidate(*namespaces: str) -> None:
+    """Drops every cached response in the given namespaces. Call after committing."""
+    for namespace in namespaces:
+        catalog_cache.invalidate(namespace)
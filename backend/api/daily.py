@@ -7,6 +7,7 @@ from sqlalchemy import func
 from sqlalchemy.orm import Session, selectinload, joinedload
 from models import User, RetailPartner, DailySalesItem, DailySalesReport, Product, Inventory 
 import models  # Assuming your SQLAlchemy models are in models.py
+from api import catalog_cache
 from db.database import get_db
 
 # --- Router Setup ---
@@ -58,10 +59,12 @@ class RetailPartnerResponse(APIBaseModel):
 
 @router.get("/all_retail", response_model=List[RetailPartnerResponse])
 def get_retail(db:Session=Depends(get_db)):
-    retails=db.query(RetailPartner).options(selectinload(RetailPartner.merchandisers)).all()
-    if not retails:
-        raise HTTPException(status_code=fastapi_status.HTTP_204_NO_CONTENT, detail="retails not found")
-    return retails
+    def build():
+        retails=db.query(RetailPartner).options(selectinload(RetailPartner.merchandisers)).all()
+        if not retails:
+            raise HTTPException(status_code=fastapi_status.HTTP_204_NO_CONTENT, detail="retails not found")
+        return [RetailPartnerResponse.model_validate(r) for r in retails]
+    return catalog_cache.cached_json_response(catalog_cache.RETAIL_PARTNERS, "daily:all_retail", build)
 
 @router.post("/retail",response_model=RetailPartnerResponse)
 def create_retail(retail:CreateRetailRequest, db:Session=Depends(get_db)):
@@ -69,6 +72,7 @@ def create_retail(retail:CreateRetailRequest, db:Session=Depends(get_db)):
     db.add(new_retail)
     try:
         db.commit()
+        catalog_cache.invalidate(catalog_cache.RETAIL_PARTNERS)
         db.refresh(new_retail)
     except Exception as e:
         db.rollback()
@@ -95,7 +99,10 @@ class ProductResponse(APIBaseModel):
 
 @router.get("/products", response_model=List[ProductResponse], tags=["Products"])
 def get_all_products(db: Session = Depends(get_db)):
-    return db.query(Product).all()
+    return catalog_cache.cached_json_response(
+        catalog_cache.PRODUCTS, "daily:products",
+        lambda: [ProductResponse.model_validate(p) for p in db.query(Product).all()]
+    )
 
 @router.get("/products/{product_id}", response_model=ProductResponse, tags=["Products"])
 def get_product_by_id(product_id: int, db: Session = Depends(get_db)):
@@ -109,6 +116,7 @@ def create_product(req: ProductCreateRequest, db: Session = Depends(get_db)):
     new_product = Product(**req.model_dump())
     db.add(new_product)
     db.commit()
+    catalog_cache.invalidate(catalog_cache.PRODUCTS)
     db.refresh(new_product)
     return new_product
 
@@ -0,0 +1,69 @@
+"""
+Fast JSON responses.
+
+`model_list_response` serializes a list of already-validated Pydantic models
+(`model_response` a single one) straight to JSON bytes with pydantic-core. A route that returns it bypasses
+FastAPI's `response_model` handling, so the items are not validated a second
+time and don't go through `jsonable_encoder`; the route keeps its
+`response_model` for the OpenAPI schema and the output is the same.
+
+`default_response_class` picks the app-wide response class from
+JSON_RESPONSE_CLASS:
+- `default`: FastAPI's own, which on recent FastAPI versions already dumps
+  routes with a `response_model` through pydantic-core.
+- `orjson`: renders responses with orjson (requires `orjson`). Note that any
+  custom class turns off FastAPI's pydantic-core path for `response_model`
+  routes, so measure with `benchmarks.serialization` before switching.
+"""
+import os
+from typing import Any, Dict, List, Optional, Type
+
+from dotenv import load_dotenv
+from fastapi import Response
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, TypeAdapter
+
+load_dotenv()
+
+JSON_RESPONSE_CLASS = os.getenv("JSON_RESPONSE_CLASS", "default").lower()
+
+_list_adapters: Dict[Type[BaseModel], TypeAdapter] = {}
+
+
+def _list_adapter(model: Type[BaseModel]) -> TypeAdapter:
+    adapter = _list_adapters.get(model)
+    if adapter is None:
+        adapter = _list_adapters[model] = TypeAdapter(List[model])
+    return adapter
+
+
+def dump_model_list(model: Type[BaseModel], items: List[BaseModel]) -> bytes:
+    """JSON bytes of `items` (instances of `model`) by alias, without re-validating them."""
+    return _list_adapter(model).dump_json(items, by_alias=True)
+
+
+def model_list_response(model: Type[BaseModel], items: List[BaseModel], headers: Optional[Dict[str, str]] = None) -> Response:
+    """A JSON response for prevalidated `items`, serialized directly to bytes."""
+    return Response(content=dump_model_list(model, items), media_type="application/json", headers=headers)
+
+
+def model_response(item: BaseModel, headers: Optional[Dict[str, str]] = None) -> Response:
+    """A JSON response for a prevalidated model, serialized directly to bytes by alias."""
+    return Response(content=item.model_dump_json(by_alias=True), media_type="application/json", headers=headers)
+
+
+class ORJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson."""
+
+    def render(self, content: Any) -> bytes:
+        import orjson  # optional dependency
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+def default_response_class() -> Optional[Type[Response]]:
+    """The configured app-wide response class, or None to keep FastAPI's default."""
+    if JSON_RESPONSE_CLASS == "orjson":
+        return ORJSONResponse
+    if JSON_RESPONSE_CLASS in ("default", "json", ""):
+        return None
+    raise ValueError(f"Unknown JSON_RESPONSE_CLASS {JSON_RESPONSE_CLASS!r}; expected 'default' or 'orjson'.")
@@ -0,0 +1,11 @@
+from fastapi import APIRouter, Depends
+
+from auth.auth_controller import get_current_admin
+from db.pool_metrics import pool_stats
+
+router = APIRouter(prefix="/internal", tags=["internal"], dependencies=[Depends(get_current_admin)])
+
+@router.get("/pool-stats")
+def get_pool_stats():
+    """Connection pool state and checkout wait statistics for each database engine. Admins only."""
+    return pool_stats()
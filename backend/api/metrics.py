@@ -0,0 +1,203 @@
+"""
+Request metrics in Prometheus text format.
+
+`MetricsMiddleware` times every HTTP request and records a latency histogram per
+method, route template and status code, plus per-route histograms of database
+time and query count taken from `db.query_metrics`. `render` produces the
+exposition text served on /metrics, together with the connection pool counters
+from `db.pool_metrics`.
+
+Recording is a bisect and a few additions under a lock, so the middleware can
+stay on in production. Routes are labelled by their template (`/sales/inventory/{store_id}`)
+and unmatched paths share one label, which keeps the number of series bounded.
+Metrics are per worker process; Prometheus aggregates across scrape targets.
+
+With QUERY_DEBUG on, the middleware also adds `X-DB-Query-Count` and
+`X-DB-Time-Ms` headers to every response and logs statements a request repeated
+`QUERY_REPEAT_THRESHOLD` or more times (an N+1 pattern), naming them in an
+`X-DB-Repeated-Queries` header.
+"""
+import logging
+import os
+import threading
+import time
+from bisect import bisect_left
+from typing import Dict, Tuple
+
+from dotenv import load_dotenv
+
+from db import query_metrics
+from db.pool_metrics import pool_stats
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() in ("1", "true", "yes")
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200)
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+class Histogram:
+    """Cumulative-on-render histogram with fixed upper bounds."""
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def lines(self, name: str, labels: str) -> list:
+        out = []
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            out.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+        out.append(f'{name}_bucket{{{labels},le="+Inf"}} {self.count}')
+        out.append(f"{name}_sum{{{labels}}} {self.sum}")
+        out.append(f"{name}_count{{{labels}}} {self.count}")
+        return out
+
+
+class RequestMetrics:
+    """Histograms for all requests served by this process."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latency: Dict[Tuple[str, str, int], Histogram] = {}
+        self.db_time: Dict[Tuple[str, str], Histogram] = {}
+        self.queries: Dict[Tuple[str, str], Histogram] = {}
+
+    def observe(self, method: str, route: str, status: int, seconds: float, stats: query_metrics.RequestQueryStats):
+        with self._lock:
+            latency = self.latency.get((method, route, status))
+            if latency is None:
+                latency = self.latency[(method, route, status)] = Histogram(LATENCY_BUCKETS)
+                self.db_time.setdefault((method, route), Histogram(LATENCY_BUCKETS))
+                self.queries.setdefault((method, route), Histogram(QUERY_COUNT_BUCKETS))
+            latency.observe(seconds)
+            self.db_time[(method, route)].observe(stats.db_time)
+            self.queries[(method, route)].observe(stats.queries)
+
+    def render(self) -> str:
+        out = []
+        with self._lock:
+            out += [
+                "# HELP http_request_duration_seconds Time to serve a request, by route template and status.",
+                "# TYPE http_request_duration_seconds histogram",
+            ]
+            for (method, route, status), histogram in sorted(self.latency.items()):
+                out += histogram.lines("http_request_duration_seconds", _labels(method=method, route=route, status=status))
+            out += [
+                "# HELP http_request_db_duration_seconds Time spent executing SQL per request.",
+                "# TYPE http_request_db_duration_seconds histogram",
+            ]
+            for (method, route), histogram in sorted(self.db_time.items()):
+                out += histogram.lines("http_request_db_duration_seconds", _labels(method=method, route=route))
+            out += [
+                "# HELP http_request_db_queries SQL statements executed per request.",
+                "# TYPE http_request_db_queries histogram",
+            ]
+            for (method, route), histogram in sorted(self.queries.items()):
+                out += histogram.lines("http_request_db_queries", _labels(method=method, route=route))
+        return "\n".join(out)
+
+
+def _labels(**labels) -> str:
+    def escape(value) -> str:
+        return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    return ",".join(f'{key}="{escape(value)}"' for key, value in labels.items())
+
+
+def _pool_lines() -> list:
+    gauges = {
+        "size": "Configured pool size.",
+        "checked_out": "Connections currently checked out.",
+        "overflow": "Overflow connections currently open.",
+    }
+    counters = {
+        "checkouts": "Connections checked out of the pool.",
+        "timeouts": "Checkouts that timed out waiting for a connection.",
+    }
+    stats = pool_stats()
+    out = []
+    for key, help_text in gauges.items():
+        out += [f"# HELP db_pool_{key} {help_text}", f"# TYPE db_pool_{key} gauge"]
+        out += [f"db_pool_{key}{{{_labels(pool=name)}}} {s[key]}" for name, s in stats.items()]
+    for key, help_text in counters.items():
+        out += [f"# HELP db_pool_{key}_total {help_text}", f"# TYPE db_pool_{key}_total counter"]
+        out += [f"db_pool_{key}_total{{{_labels(pool=name)}}} {s[key]}" for name, s in stats.items()]
+    out += ["# HELP db_pool_wait_seconds_total Time spent waiting for a connection.", "# TYPE db_pool_wait_seconds_total counter"]
+    out += [f"db_pool_wait_seconds_total{{{_labels(pool=name)}}} {s['wait_total_ms'] / 1000}" for name, s in stats.items()]
+    return out
+
+
+request_metrics = RequestMetrics()
+
+
+def render() -> str:
+    """All metrics of this process in Prometheus text exposition format."""
+    return "\n".join([request_metrics.render(), *_pool_lines()]) + "\n"
+
+
+def _route(scope) -> str:
+    # The router stores the matched route in the scope
+    return getattr(scope.get("route"), "path", None) or UNMATCHED_ROUTE
+
+
+def _debug_headers(scope, stats: query_metrics.RequestQueryStats) -> list:
+    headers = [
+        (b"x-db-query-count", str(stats.queries).encode()),
+        (b"x-db-time-ms", f"{stats.db_time * 1000:.2f}".encode()),
+    ]
+    repeated = stats.repeated()
+    if repeated:
+        for shape, count in repeated:
+            logger.warning("Possible N+1 on %s %s: %d executions of %s", scope["method"], _route(scope), count, shape)
+        headers.append((b"x-db-repeated-queries", "; ".join(
+            f"{count}x {' '.join(shape.split())[:120]}" for shape, count in repeated
+        ).encode("latin-1", "replace")))
+    return headers
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware recording `request_metrics` for every HTTP request and,
+    with QUERY_DEBUG, adding the request's query stats to the response headers.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if query_metrics.QUERY_DEBUG:
+                    message["headers"] = [*message.get("headers", []), *_debug_headers(scope, stats)]
+            await send(message)
+
+        stats, token = query_metrics.start()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started
+            query_metrics.stop(token)
+            if METRICS_ENABLED:
+                request_metrics.observe(scope["method"], _route(scope), status_code, elapsed, stats)
@@ -1,13 +1,28 @@
-from datetime import date, datetime
-from typing import Dict, List, Optional, Literal
-
-from fastapi import APIRouter, Depends, HTTPException, Path, status as fastapi_status
+import base64
+import csv
+import hashlib
+import io
+import json
+import os
+from datetime import date, datetime, timedelta
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Dict, List, Optional, Literal, Tuple, Union
+
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, Request, Response, status as fastapi_status
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field, computed_field
-from sqlalchemy import func
-from sqlalchemy.orm import Session, selectinload, joinedload
+from sqlalchemy import (
+    Date, DateTime, Float, Integer, Numeric, Text, cast, column, func, insert, literal, select, tuple_, union_all,
+    update, values,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, aggregate_order_by, insert as pg_insert
+from sqlalchemy.orm import Session, aliased, selectinload, joinedload
 
 import models  # Assuming your SQLAlchemy models are in models.py
+from api import catalog_cache, fast_json
+from db import archive, partitions, rollup, stock
 from db.database import get_db
+from db.session import SessionLocal
 
 # --- Router Setup ---
 router = APIRouter(prefix="/sales")
@@ -68,18 +83,20 @@ class RetailPartnerResponse(APIBaseModel):
 @router.get("/retail-partners", response_model=List[RetailPartnerResponse], tags=["Retail Partners"])
 def get_retail_partners(db: Session = Depends(get_db)):
     """Retrieves all retail partners with their associated merchandisers."""
-    partners_db = db.query(models.RetailPartner).options(
-        selectinload(models.RetailPartner.merchandisers)
-    ).all()
-    # Pydantic's `model_validate` handles the mapping including the merchandiser list
-    return [RetailPartnerResponse.model_validate(p) for p in partners_db]
+    def build():
+        partners_db = db.query(models.RetailPartner).options(
+            selectinload(models.RetailPartner.merchandisers)
+        ).all()
+        # Pydantic's `model_validate` handles the mapping including the merchandiser list
+        return [RetailPartnerResponse.model_validate(p) for p in partners_db]
+    return catalog_cache.cached_json_response(catalog_cache.RETAIL_PARTNERS, "sales:retail-partners", build)
 
 @router.get("/retail-partners/{id}", response_model=List[RetailPartnerResponse], tags=["Retail Partners"])
-def get_retail_partners(id:int,db: Session = Depends(get_db)):
-    """Retrieves all retail partners with their associated merchandisers."""
+def get_retail_partner_by_id(id:int,db: Session = Depends(get_db)):
+    """Retrieves a retail partner with its associated merchandisers."""
     partners_db = db.query(models.RetailPartner).options(
         selectinload(models.RetailPartner.merchandisers)
-    ).filter_by(id==id).all()
+    ).filter_by(id=id).all()
     # Pydantic's `model_validate` handles the mapping including the merchandiser list
     return [RetailPartnerResponse.model_validate(p) for p in partners_db]
 
@@ -89,6 +106,7 @@ def create_retail_partner(req: CreateRetailRequest, db: Session = Depends(get_db
     db_partner = models.RetailPartner(name=req.name, location=req.location)
     db.add(db_partner)
     db.commit()
+    catalog_cache.invalidate(catalog_cache.RETAIL_PARTNERS)
     db.refresh(db_partner)
     # The new partner will have an empty merchandisers list initially
     return RetailPartnerResponse.model_validate(db_partner)
@@ -118,7 +136,10 @@ class ProductResponse(APIBaseModel):
 @router.get("/products", response_model=List[ProductResponse], tags=["Products"])
 def get_all_products(db: Session = Depends(get_db)):
     """Retrieves a list of all products."""
-    return db.query(models.Product).all()
+    return catalog_cache.cached_json_response(
+        catalog_cache.PRODUCTS, "sales:products",
+        lambda: [ProductResponse.model_validate(p) for p in db.query(models.Product).all()]
+    )
 
 @router.get("/products/{product_id}", response_model=ProductResponse, tags=["Products"])
 def get_product_by_id(product_id: int, db: Session = Depends(get_db)):
@@ -134,6 +155,7 @@ def create_product(req: ProductCreateRequest, db: Session = Depends(get_db)):
     new_product = models.Product(**req.model_dump())
     db.add(new_product)
     db.commit()
+    catalog_cache.invalidate(catalog_cache.PRODUCTS)
     db.refresh(new_product)
     return new_product
 
@@ -183,13 +205,99 @@ class FlatInventoryItemResponse(APIBaseModel):
     quantity: int
     unit_selling_price: float = Field(alias="unitSellingPrice")
 
+# --- Inventory ETag Helpers ---
+def _catalog_marker(key, *columns):
+    """md5 over the given columns of every row of a catalog table, in `key` order."""
+    return select(func.md5(func.string_agg(
+        func.concat_ws("|", *columns), aggregate_order_by(literal(","), key)
+    ))).scalar_subquery()
+
+def _inventory_etag(db: Session, scope: str, store_id: Optional[int] = None) -> str:
+    """
+    Strong ETag for an inventory read, derived from a cheap aggregate over the
+    inventory rows in scope plus digests of the product and store names the
+    payload shows, without running the join or serializing the payload. Only
+    database state goes in, so every worker computes the same tag.
+    """
+    product = models.Product
+    partner = models.RetailPartner
+    partners = select(partner.id, partner.name)
+    if store_id is not None:
+        partners = partners.where(partner.id == store_id)
+    partners = partners.subquery()
+    marker_query = db.query(
+        func.max(models.Inventory.last_updated),
+        func.count(models.Inventory.id),
+        func.sum(models.Inventory.quantity),
+        _catalog_marker(product.id, product.id, product.name, product.category),
+        _catalog_marker(partners.c.id, partners.c.id, partners.c.name),
+    )
+    if store_id is not None:
+        marker_query = marker_query.filter(models.Inventory.retail_partner_id == store_id)
+    marker = "|".join(str(value) for value in marker_query.one())
+    raw = f"{scope}|{store_id}|{marker}"
+    return '"' + hashlib.sha1(raw.encode()).hexdigest() + '"'
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    """Whether the request's If-None-Match header matches `etag`."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = [tag.strip().removeprefix("W/") for tag in header.split(",")]
+    return "*" in candidates or etag in candidates
+
+def _not_modified(etag: str) -> Response:
+    return Response(status_code=fastapi_status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag, "Cache-Control": "no-cache"})
+
+def _inventory_details_response(db: Session, etag: str, store_id: Optional[int] = None) -> Response:
+    """
+    Builds the `List[StoreInventoryResponse]` body in Postgres: one JSON document
+    per store, with its products aggregated by `json_agg`. Only the needed columns
+    are read, and no ORM objects or Pydantic models are created per row.
+    """
+    inventory = models.Inventory
+    product = models.Product
+    partner = models.RetailPartner
+    product_json = func.json_build_object(
+        "productId", product.id,
+        "productName", product.name,
+        "category", product.category,
+        "quantity", inventory.quantity,
+        "unitSellingPrice", cast(inventory.unit_selling_price, Float),
+        "totalValue", cast(func.round(inventory.quantity * inventory.unit_selling_price, 2), Float),
+    )
+    store_json = func.json_build_object(
+        "retailPartnerId", partner.id,
+        "storeName", partner.name,
+        "products", func.json_agg(aggregate_order_by(product_json, inventory.product_id)),
+    )
+    stmt = select(cast(store_json, Text)).select_from(inventory).join(
+        partner, partner.id == inventory.retail_partner_id
+    ).join(
+        product, product.id == inventory.product_id
+    ).group_by(partner.id, partner.name).order_by(partner.id)
+    if store_id is not None:
+        stmt = stmt.where(inventory.retail_partner_id == store_id)
+
+    stores = db.execute(stmt).scalars()
+    body = "[" + ",".join(stores) + "]"
+    return Response(content=body, media_type="application/json", headers={"ETag": etag, "Cache-Control": "no-cache"})
+
 # --- Inventory Endpoints ---
 @router.get("/inventory/summary", response_model=List[InventorySummaryResponse], tags=["Inventory"])
-def get_inventory_summary(db: Session = Depends(get_db)):
+def get_inventory_summary(request: Request, response: Response, db: Session = Depends(get_db)):
     """
     Retrieves a summary of inventory for each retail partner, including
     total quantity and total value of stock.
+
+    Supports `If-None-Match`: returns 304 when the inventory hasn't changed.
     """
+    etag = _inventory_etag(db, "summary")
+    if _etag_matches(request, etag):
+        return _not_modified(etag)
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "no-cache"
+
     summary_query = db.query(
         models.Inventory.retail_partner_id,
         models.RetailPartner.name.label("store_name"),
@@ -206,74 +314,32 @@ def get_inventory_summary(db: Session = Depends(get_db)):
     return [InventorySummaryResponse.model_validate(row) for row in summary_query]
 
 @router.get("/inventory/details-by-store", response_model=List[StoreInventoryResponse], tags=["Inventory"])
-def get_detailed_inventory_by_store(db: Session = Depends(get_db)):
+def get_detailed_inventory_by_store(request: Request, db: Session = Depends(get_db)):
     """
     Retrieves detailed inventory for each store, listing all products
     with their quantities, selling prices, and total value per product line.
-    """
-    all_items = db.query(models.Inventory).options(
-        joinedload(models.Inventory.product),
-        joinedload(models.Inventory.retail_partner)
-    ).order_by(models.Inventory.retail_partner_id, models.Inventory.product_id).all()
-
-    grouped_data: Dict[int, StoreInventoryResponse] = {}
-    for item in all_items:
-        if not item.retail_partner or not item.product:
-            continue
-        
-        partner_id = item.retail_partner_id
-        if partner_id not in grouped_data:
-            grouped_data[partner_id] = StoreInventoryResponse(
-                retailPartnerId=partner_id,
-                storeName=item.retail_partner.name,
-                products=[]
-            )
 
-        product_detail = InventoryProductDetail(
-            productId=item.product.id,
-            productName=item.product.name,
-            category=item.product.category,
-            quantity=item.quantity,
-            unitSellingPrice=item.unit_selling_price
-        )
-        grouped_data[partner_id].products.append(product_detail)
+    Supports `If-None-Match`: returns 304 when the inventory hasn't changed.
+    """
+    etag = _inventory_etag(db, "details")
+    if _etag_matches(request, etag):
+        return _not_modified(etag)
 
-    return list(grouped_data.values())
+    return _inventory_details_response(db, etag)
 
 @router.get("/inventory/{store_id}", response_model=List[StoreInventoryResponse], tags=["Inventory"])
-def get_detailed_inventory_by_store_id(store_id:int, db: Session = Depends(get_db)):
+def get_detailed_inventory_by_store_id(store_id:int, request: Request, db: Session = Depends(get_db)):
     """
     Retrieves detailed inventory for particular store, listing all products
     with their quantities, selling prices, and total value per product line.
-    """
-    all_items = db.query(models.Inventory).options(
-        joinedload(models.Inventory.product),
-        joinedload(models.Inventory.retail_partner)
-    ).order_by(models.Inventory.retail_partner_id, models.Inventory.product_id).filter(models.Inventory.retail_partner_id==store_id).all()
 
-    grouped_data: Dict[int, StoreInventoryResponse] = {}
-    for item in all_items:
-        if not item.retail_partner or not item.product:
-            continue
-        
-        partner_id = item.retail_partner_id
-        if partner_id not in grouped_data:
-            grouped_data[partner_id] = StoreInventoryResponse(
-                retailPartnerId=partner_id,
-                storeName=item.retail_partner.name,
-                products=[]
-            )
-
-        product_detail = InventoryProductDetail(
-            productId=item.product.id,
-            productName=item.product.name,
-            category=item.product.category,
-            quantity=item.quantity,
-            unitSellingPrice=item.unit_selling_price
-        )
-        grouped_data[partner_id].products.append(product_detail)
+    Supports `If-None-Match`: returns 304 when the store's inventory hasn't changed.
+    """
+    etag = _inventory_etag(db, "details", store_id)
+    if _etag_matches(request, etag):
+        return _not_modified(etag)
 
-    return list(grouped_data.values())
+    return _inventory_details_response(db, etag, store_id)
 
 @router.post("/inventory", response_model=FlatInventoryItemResponse, status_code=fastapi_status.HTTP_201_CREATED, tags=["Inventory"])
 def create_inventory_item(req: CreateInventoryRequest, db: Session = Depends(get_db)):
@@ -318,6 +384,18 @@ class DailySalesReportCreate(APIBaseModel):
     status: Literal['submitted', 'pending', 'approved', 'rejected'] = 'pending'
     notes: Optional[str] = None
 
+CENT = Decimal("0.01")
+
+def _line_values(quantity: int, price, discount) -> Tuple[Decimal, Decimal]:
+    """
+    Gross and discounted value of one sales line in exact decimals, the discounted
+    value rounded half up to cents as Postgres' numeric `round` does in the
+    summary totals, the rollup and the archive (`rollup.line_values`).
+    """
+    gross = Decimal(str(price)) * quantity
+    net = (gross * (100 - Decimal(str(discount or 0))) / 100).quantize(CENT, ROUND_HALF_UP)
+    return gross, net
+
 class DailySalesItemResponse(APIBaseModel):
     """Response for a single sales item, matches TS 'DailySalesItem'."""
     product_id: int = Field(alias="productId")
@@ -326,12 +404,13 @@ class DailySalesItemResponse(APIBaseModel):
     sales_price: float = Field(alias="salesPrice")
     discount_percent: float = Field(alias="discountPercent")
 
+    def line_values(self) -> Tuple[Decimal, Decimal]:
+        return _line_values(self.quantity_sold, self.sales_price, self.discount_percent)
+
     @computed_field(alias="finalPrice")
     @property
     def final_price(self) -> float:
-        value = self.sales_price * self.quantity_sold
-        discount = value * (self.discount_percent / 100)
-        return round(value - discount, 2)
+        return float(self.line_values()[1])
 
 class DailySalesReportResponse(APIBaseModel):
     """Response for a full sales report, matches TS 'DailySalesReport'."""
@@ -353,19 +432,318 @@ class DailySalesReportResponse(APIBaseModel):
     @computed_field(alias="totalSales")
     @property
     def total_sales_value(self) -> float:
-        return round(sum(item.sales_price * item.quantity_sold for item in self.data), 2)
+        return float(sum((item.line_values()[0] for item in self.data), Decimal(0)))
 
     @computed_field(alias="finalValue")
     @property
     def final_value_after_discount(self) -> float:
-        return round(sum(item.final_price for item in self.data), 2)
+        return float(sum((item.line_values()[1] for item in self.data), Decimal(0)))
+
+class DailySalesReportSummaryResponse(APIBaseModel):
+    """Response for a sales report without line items; totals are computed in SQL."""
+    id: int = Field(alias="salesId")
+    merchandiser_id: int = Field(alias="merchandiserId")
+    merchandiser_name: str = Field(alias="merchandiserName")
+    retail_partner_id: int = Field(alias="retailPartnerId")
+    report_date: date = Field(alias="reportDate")
+    status: Literal['submitted', 'pending', 'approved', 'rejected']
+    notes: Optional[str] = None
+    submitted_at: Optional[datetime] = Field(default=None, alias="submittedAt")
+    total_quantity: int = Field(alias="totalQuantity")
+    total_sales_value: float = Field(alias="totalSales")
+    final_value_after_discount: float = Field(alias="finalValue")
+
+class DailySalesReportPage(APIBaseModel):
+    """One page of sales reports and the cursor of the next page (None on the last one)."""
+    data: List[DailySalesReportResponse]
+    next_cursor: Optional[str] = Field(default=None, alias="nextCursor")
+
+class DailySalesReportSummaryPage(APIBaseModel):
+    """One page of sales report summaries, as `DailySalesReportPage`."""
+    data: List[DailySalesReportSummaryResponse]
+    next_cursor: Optional[str] = Field(default=None, alias="nextCursor")
 
 class UpdateDaiyThreadRequest(APIBaseModel):
     id: int = Field(alias="salesId")
     status: Literal['approved', 'rejected'] = 'pending'
 
+# --- Daily Sales Pagination Helpers ---
+DEFAULT_REPORTS_PAGE_SIZE = 100
+MAX_REPORTS_PAGE_SIZE = 500
+
+def _encode_report_cursor(report_date: date, report_id: int) -> str:
+    """Encodes the (report_date, id) keyset position as an opaque cursor string."""
+    raw = json.dumps([report_date.isoformat(), report_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def _decode_report_cursor(cursor: str) -> Tuple[date, int]:
+    """Decodes a cursor produced by `_encode_report_cursor`."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        report_date, report_id = json.loads(base64.urlsafe_b64decode(padded))
+        return date.fromisoformat(report_date), int(report_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=fastapi_status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+def _reports_response(view: str, items: list, paginated: bool, next_cursor: Optional[str]) -> Response:
+    """
+    The reports listing body: a plain list when no page was asked for, else a
+    page carrying `nextCursor` (also sent as the `X-Next-Cursor` header).
+    """
+    if view == 'summary':
+        model, page_model = DailySalesReportSummaryResponse, DailySalesReportSummaryPage
+    else:
+        model, page_model = DailySalesReportResponse, DailySalesReportPage
+    if not paginated:
+        return fast_json.model_list_response(model, items)
+    headers = {"X-Next-Cursor": next_cursor} if next_cursor is not None else None
+    return fast_json.model_response(page_model.model_construct(data=items, next_cursor=next_cursor), headers)
+
+def _report_totals(db: Session, report_ids: List[int]) -> Dict[int, Tuple[int, float, float]]:
+    """
+    Computes (totalQuantity, totalSales, finalValue) per report with one grouped
+    query over `daily_sales_items`, mirroring the computed fields on
+    `DailySalesReportResponse`: both round each line half up to cents.
+    """
+    if not report_ids:
+        return {}
+    return _report_totals_by_id(db.execute(_report_totals_statement(report_ids)).all())
+
+def _report_totals_statement(report_ids: List[int]):
+    item = models.DailySalesItem
+    line_value = item.quantity_sold * item.unit_price
+    line_final = func.round(line_value * (100 - func.coalesce(item.discount_percent, 0)) / 100, 2)
+    return select(
+        item.report_id,
+        func.sum(item.quantity_sold),
+        func.sum(line_value),
+        func.sum(line_final),
+    ).where(item.report_id.in_(report_ids)).group_by(item.report_id)
+
+def _report_totals_by_id(rows) -> Dict[int, Tuple[int, float, float]]:
+    return {
+        report_id: (int(quantity or 0), round(float(sales or 0), 2), round(float(final or 0), 2))
+        for report_id, quantity, sales, final in rows
+    }
+
+# --- Daily Sales Report Loader ---
+def _report_response(report: models.DailySalesReport) -> DailySalesReportResponse:
+    """Builds the full response for a report whose merchandiser, items and products are loaded."""
+    items_response = [
+        DailySalesItemResponse(
+            productId=item.product_id,
+            productName=item.product.name if item.product else "N/A",
+            quantitySold=item.quantity_sold,
+            salesPrice=item.unit_price, # Assuming DB model's `unit_price` holds the sales price
+            discountPercent=item.discount_percent
+        ) for item in report.sales_items
+    ]
+    return DailySalesReportResponse(
+        salesId=report.id,
+        data=items_response,
+        merchandiserId=report.merchandiser_id,
+        merchandiserName=report.merchandiser.name if report.merchandiser else "Unknown Merchandiser",
+        retailPartnerId=report.retail_partner_id,
+        reportDate=report.report_date,
+        status=report.status,
+        notes=report.notes,
+        submittedAt=report.submitted_at
+    )
+
+def _report_load_options():
+    """Eager-load options giving a constant number of queries regardless of item count."""
+    return (
+        selectinload(models.DailySalesReport.merchandiser), # Eager load merchandiser for the name
+        selectinload(models.DailySalesReport.sales_items).selectinload(models.DailySalesItem.product),
+    )
+
+def _report_statement(report_id: int):
+    """Selects a single report with everything needed for `DailySalesReportResponse`."""
+    return select(models.DailySalesReport).options(
+        *_report_load_options()
+    ).where(models.DailySalesReport.id == report_id).limit(1)
+
+def _load_report_response(db: Session, report_id: int) -> Optional[DailySalesReportResponse]:
+    """Loads a single report with everything needed for `DailySalesReportResponse`."""
+    report = db.scalars(_report_statement(report_id)).first()
+    return _report_response(report) if report else None
+
+def _reports_statement(
+    status: Optional[str],
+    merchandiser_id: Optional[int],
+    retail_partner_id: Optional[int],
+    report_date: Optional[date],
+    saleid: Optional[int],
+    limit: Optional[int],
+    cursor: Optional[str],
+    view: str,
+):
+    """
+    The query of `get_daily_sales_reports`, newest first. With a `limit` it
+    selects one extra row, which `_reports_page` uses to tell whether another
+    page exists.
+    """
+    report = models.DailySalesReport
+    query = select(report)
+
+    # Apply filters conditionally
+    if merchandiser_id is not None:
+        query = query.where(report.merchandiser_id == merchandiser_id)
+    if retail_partner_id is not None:
+        query = query.where(report.retail_partner_id == retail_partner_id)
+    if report_date is not None:
+        query = query.where(report.report_date == report_date)
+    if saleid is not None:
+        query = query.where(report.id == saleid)
+    if status is not None:
+        query = query.where(report.status == status)
+    if cursor is not None:
+        cursor_date, cursor_id = _decode_report_cursor(cursor)
+        query = query.where(tuple_(report.report_date, report.id) < tuple_(cursor_date, cursor_id))
+
+    # Eagerly load related data for efficiency and order the results
+    if view == 'full':
+        query = query.options(*_report_load_options())
+    else:
+        query = query.options(selectinload(report.merchandiser)) # Eager load merchandiser for the name
+    query = query.order_by(report.report_date.desc(), report.id.desc())
+    return query.limit(limit + 1) if limit is not None else query
+
+def _reports_page(reports_db: list, limit: Optional[int]) -> Tuple[list, Optional[str]]:
+    """Trims the rows of `_reports_statement` to the page and returns them with the next cursor."""
+    if limit is None or len(reports_db) <= limit:
+        return reports_db, None
+    reports_db = reports_db[:limit]
+    last = reports_db[-1]
+    return reports_db, _encode_report_cursor(last.report_date, last.id)
+
+def _reports_listing(
+    view: str,
+    reports_db: list,
+    totals: Dict[int, Tuple[int, float, float]],
+    paginated: bool,
+    next_cursor: Optional[str],
+) -> Response:
+    """The `get_daily_sales_reports` response for loaded reports (and their `_report_totals` in the summary view)."""
+    if view == 'summary':
+        summary_list = []
+        for report in reports_db:
+            total_quantity, total_sales, final_value = totals.get(report.id, (0, 0.0, 0.0))
+            summary_list.append(
+                DailySalesReportSummaryResponse(
+                    salesId=report.id,
+                    merchandiserId=report.merchandiser_id,
+                    merchandiserName=report.merchandiser.name if report.merchandiser else "Unknown Merchandiser",
+                    retailPartnerId=report.retail_partner_id,
+                    reportDate=report.report_date,
+                    status=report.status,
+                    notes=report.notes,
+                    submittedAt=report.submitted_at,
+                    totalQuantity=total_quantity,
+                    totalSales=total_sales,
+                    finalValue=final_value
+                )
+            )
+        return _reports_response(view, summary_list, paginated, next_cursor)
+
+    # Items are built from validated models, so skip the response_model pass
+    return _reports_response(view, [_report_response(report) for report in reports_db], paginated, next_cursor)
+
+def _page_limit(limit: Optional[int], cursor: Optional[str]) -> Optional[int]:
+    """The page size of a listing: `limit`, or the default when only a cursor is given."""
+    if cursor is not None and limit is None:
+        return DEFAULT_REPORTS_PAGE_SIZE
+    return limit
+
+def _archived_reports_page(
+    db: Session,
+    report_date: date,
+    status: Optional[str],
+    merchandiser_id: Optional[int],
+    retail_partner_id: Optional[int],
+    saleid: Optional[int],
+    limit: Optional[int],
+    cursor: Optional[str],
+    view: str,
+) -> Response:
+    """
+    `get_daily_sales_reports` for a `report_date` in an archived month: the
+    same page and cursor, read from the sales archive.
+    """
+    statuses = [status] if status is not None else None
+    reports = archive.read_reports(
+        report_date, report_date, report_id=saleid, merchandiser_id=merchandiser_id,
+        retail_partner_id=retail_partner_id, statuses=statuses,
+    ).to_pylist()
+    if cursor is not None:
+        cursor_position = _decode_report_cursor(cursor)
+        reports = [report for report in reports if (report["report_date"], report["id"]) < cursor_position]
+    reports.sort(key=lambda report: report["id"], reverse=True)
+
+    next_cursor = None
+    if limit is not None and len(reports) > limit:
+        reports = reports[:limit]
+        next_cursor = _encode_report_cursor(report_date, reports[-1]["id"])
+    merchandiser_names = dict(db.execute(
+        select(models.User.id, models.User.name).where(models.User.id.in_({r["merchandiser_id"] for r in reports}))
+    ).all())
+    report_fields = [
+        dict(
+            salesId=report["id"],
+            merchandiserId=report["merchandiser_id"],
+            merchandiserName=merchandiser_names.get(report["merchandiser_id"], "Unknown Merchandiser"),
+            retailPartnerId=report["retail_partner_id"],
+            reportDate=report["report_date"],
+            status=report["status"],
+            notes=report["notes"],
+            submittedAt=report["submitted_at"],
+        ) for report in reports
+    ]
+
+    if view == 'summary':
+        totals = {
+            total["report_id"]: total for total in archive.totals(
+                report_date, report_date, ["report_id"], merchandiser_id=merchandiser_id,
+                retail_partner_id=retail_partner_id, statuses=statuses,
+            )
+        }
+        summary_list = []
+        for fields in report_fields:
+            total = totals.get(fields["salesId"], {"quantity": 0, "gross_value": 0, "net_value": 0})
+            summary_list.append(DailySalesReportSummaryResponse(
+                **fields,
+                totalQuantity=total["quantity"],
+                totalSales=round(float(total["gross_value"]), 2),
+                finalValue=round(float(total["net_value"]), 2),
+            ))
+        return _reports_response(view, summary_list, limit is not None, next_cursor)
+
+    items = archive.read_items(report_date, report_date, report_ids=[r["id"] for r in reports]).to_pylist() if reports else []
+    product_names = dict(db.execute(
+        select(models.Product.id, models.Product.name).where(models.Product.id.in_({i["product_id"] for i in items}))
+    ).all())
+    items_by_report: Dict[int, List[DailySalesItemResponse]] = {}
+    for item in items:
+        items_by_report.setdefault(item["report_id"], []).append(DailySalesItemResponse(
+            productId=item["product_id"],
+            productName=product_names.get(item["product_id"], "N/A"),
+            quantitySold=item["quantity_sold"],
+            salesPrice=item["unit_price"],
+            discountPercent=item["discount_percent"],
+        ))
+    return _reports_response(view, [
+        DailySalesReportResponse(**fields, data=items_by_report.get(fields["salesId"], [])) for fields in report_fields
+    ], limit is not None, next_cursor)
+
 # --- Daily Sales Endpoints ---
-@router.get('/daily-sales-reports', response_model=List[DailySalesReportResponse], tags=["Daily Sales"])
+@router.get(
+    '/daily-sales-reports',
+    response_model=Union[
+        List[DailySalesReportResponse], List[DailySalesReportSummaryResponse],
+        DailySalesReportPage, DailySalesReportSummaryPage,
+    ],
+    tags=["Daily Sales"],
+)
 def get_daily_sales_reports(
     db: Session = Depends(get_db),
     status: Optional[Literal['submitted', 'pending', 'approved', 'rejected']] = None,
@@ -373,123 +751,359 @@ def get_daily_sales_reports(
     retail_partner_id: Optional[int] = None,
     report_date: Optional[date] = None,
     saleid: Optional[int] = None,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_REPORTS_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    view: Literal['full', 'summary'] = 'full',
 ):
     """
-    Retrieves daily sales reports with full details.
+    Retrieves daily sales reports with full details, newest first.
 
     Can be filtered by providing optional query parameters:
     - `merchandiser_id`: Filter reports by a specific merchandiser.
     - `retail_partner_id`: Filter reports for a specific retail partner.
     - `report_date`: Filter reports for a specific date (YYYY-MM-DD).
+
+    Without `limit` or `cursor` every matching report is returned as a list.
+    With either, results are paginated by keyset on `(report_date desc, id desc)`
+    and the body is a page `{"data": [...], "nextCursor": ...}`:
+    - `limit`: Maximum number of reports to return (default 100 with a `cursor`).
+    - `cursor`: The `nextCursor` of the previous page.
+    `nextCursor` is null on the last page; it is also sent as the
+    `X-Next-Cursor` header, which is omitted on the last page.
+
+    With `view=summary` the line items are not loaded; each report carries only
+    its `totalQuantity`, `totalSales` and `finalValue`, computed in the database.
+
+    A `report_date` in an archived month is answered from the sales archive.
     """
-    # Start with a base query
-    query = db.query(models.DailySalesReport)
+    limit = _page_limit(limit, cursor)
+    if report_date is not None and archive.is_archived(report_date):
+        return _archived_reports_page(
+            db, report_date, status, merchandiser_id, retail_partner_id, saleid, limit, cursor, view
+        )
 
-    # Apply filters conditionally
-    if merchandiser_id is not None:
-        query = query.filter(models.DailySalesReport.merchandiser_id == merchandiser_id)
+    reports_db, next_cursor = _reports_page(db.scalars(_reports_statement(
+        status, merchandiser_id, retail_partner_id, report_date, saleid, limit, cursor, view
+    )).all(), limit)
+    totals = _report_totals(db, [report.id for report in reports_db]) if view == 'summary' else {}
+    return _reports_listing(view, reports_db, totals, limit is not None, next_cursor)
+
+# --- Daily Sales Export ---
+EXPORT_BATCH_SIZE = 1000
+
+EXPORT_COLUMNS = [
+    "salesId", "reportDate", "status", "merchandiserId", "merchandiserName",
+    "retailPartnerId", "storeName", "productId", "productName", "category",
+    "quantitySold", "salesPrice", "discountPercent", "finalPrice",
+]
+
+def _export_rows(
+    start_date: Optional[date],
+    end_date: Optional[date],
+    retail_partner_id: Optional[int],
+    status: Optional[str],
+):
+    """
+    Yields one flat tuple per sales item, read through a server-side cursor in
+    batches of `EXPORT_BATCH_SIZE`. Uses its own session because the response
+    body is produced after the request's dependencies have been closed.
+    Archived months in the range are read from the sales archive, in order.
+    """
+    with SessionLocal() as db:
+        segment_start = start_date
+        for month in archive.months_between(start_date, end_date):
+            month_end = partitions.add_months(month, 1) - timedelta(days=1)
+            if segment_start is None or segment_start < month:
+                yield from _export_db_rows(db, segment_start, month - timedelta(days=1), retail_partner_id, status)
+            yield from _export_archived_rows(
+                db, max(segment_start or month, month), min(end_date or month_end, month_end), retail_partner_id, status
+            )
+            segment_start = month_end + timedelta(days=1)
+        if end_date is None or segment_start is None or segment_start <= end_date:
+            yield from _export_db_rows(db, segment_start, end_date, retail_partner_id, status)
+
+def _export_line(row: tuple) -> tuple:
+    """Appends the final price to an export row ending in quantity, price and discount."""
+    quantity, price, discount = row[10], row[11], row[12] or 0
+    return (*row[:11], float(price), float(discount), float(_line_values(quantity, price, discount)[1]))
+
+def _export_db_rows(
+    db: Session,
+    start_date: Optional[date],
+    end_date: Optional[date],
+    retail_partner_id: Optional[int],
+    status: Optional[str],
+):
+    report = models.DailySalesReport
+    item = models.DailySalesItem
+    stmt = select(
+        report.id, report.report_date, report.status,
+        report.merchandiser_id, models.User.name,
+        report.retail_partner_id, models.RetailPartner.name,
+        item.product_id, models.Product.name, models.Product.category,
+        item.quantity_sold, item.unit_price, item.discount_percent,
+    ).join(item, (item.report_id == report.id) & (item.report_date == report.report_date)
+    ).join(models.Product, models.Product.id == item.product_id
+    ).join(models.User, models.User.id == report.merchandiser_id
+    ).join(models.RetailPartner, models.RetailPartner.id == report.retail_partner_id
+    ).order_by(report.report_date, report.id, item.id)
+
+    # Both sides so each table's partitions are pruned
+    if start_date is not None:
+        stmt = stmt.where(report.report_date >= start_date, item.report_date >= start_date)
+    if end_date is not None:
+        stmt = stmt.where(report.report_date <= end_date, item.report_date <= end_date)
     if retail_partner_id is not None:
-        query = query.filter(models.DailySalesReport.retail_partner_id == retail_partner_id)
-    if report_date is not None:
-        query = query.filter(models.DailySalesReport.report_date == report_date)
-    if saleid is not None:
-        query = query.filter(models.DailySalesReport.id == saleid)
+        stmt = stmt.where(report.retail_partner_id == retail_partner_id)
     if status is not None:
-        query = query.filter(models.DailySalesReport.status == status)
+        stmt = stmt.where(report.status == status)
+
+    result = db.execute(stmt.execution_options(stream_results=True, yield_per=EXPORT_BATCH_SIZE))
+    for partition in result.partitions():
+        for row in partition:
+            yield _export_line(row)
+
+def _export_archived_rows(
+    db: Session,
+    start_date: date,
+    end_date: date,
+    retail_partner_id: Optional[int],
+    status: Optional[str],
+):
+    lines = archive.lines(
+        start_date, end_date, retail_partner_id=retail_partner_id, statuses=[status] if status is not None else None
+    )
+    if lines is None or lines.num_rows == 0:
+        return
+    columns = lines.select([
+        "report_id", "report_date", "status", "merchandiser_id", "retail_partner_id",
+        "product_id", "quantity_sold", "unit_price", "discount_percent",
+    ]).to_pydict()
+    users = dict(db.execute(select(models.User.id, models.User.name)
+                            .where(models.User.id.in_(set(columns["merchandiser_id"])))).all())
+    stores = dict(db.execute(select(models.RetailPartner.id, models.RetailPartner.name)
+                             .where(models.RetailPartner.id.in_(set(columns["retail_partner_id"])))).all())
+    products = {row.id: row for row in db.execute(select(models.Product.id, models.Product.name, models.Product.category)
+                                                  .where(models.Product.id.in_(set(columns["product_id"]))))}
+    for report_id, report_date, report_status, merchandiser_id, partner_id, product_id, quantity, price, discount in zip(*columns.values()):
+        # Rows whose merchandiser, store or product no longer exists are skipped, like the inner joins do
+        if merchandiser_id not in users or partner_id not in stores or product_id not in products:
+            continue
+        product = products[product_id]
+        yield _export_line((
+            report_id, report_date, report_status, merchandiser_id, users[merchandiser_id],
+            partner_id, stores[partner_id], product_id, product.name, product.category, quantity, price, discount,
+        ))
 
-    # Eagerly load related data for efficiency and order the results
-    reports_db = query.options(
-        selectinload(models.DailySalesReport.merchandiser), # Eager load merchandiser for the name
-        selectinload(models.DailySalesReport.sales_items).selectinload(models.DailySalesItem.product)
-    ).order_by(models.DailySalesReport.report_date.desc(), models.DailySalesReport.id.desc()).all()
-
-    # Manually construct the response to populate derived fields like 'productName' and 'merchandiserName'
-    response_list = []
-    for report in reports_db:
-        items_response = [
-            DailySalesItemResponse(
-                productId=item.product_id,
-                productName=item.product.name if item.product else "N/A",
-                quantitySold=item.quantity_sold,
-                salesPrice=item.unit_price, # Assuming DB model's `unit_price` holds the sales price
-                discountPercent=item.discount_percent
-            ) for item in report.sales_items
-        ]
-        
-        response_list.append(
-            DailySalesReportResponse(
-                salesId=report.id,
-                data=items_response,
-                merchandiserId=report.merchandiser_id,
-                merchandiserName=report.merchandiser.name if report.merchandiser else "Unknown Merchandiser",
-                retailPartnerId=report.retail_partner_id,
-                reportDate=report.report_date,
-                status=report.status,
-                notes=report.notes,
-                submittedAt=report.submitted_at
-            )
-        )
-    return response_list
+def _stream_csv(rows):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_COLUMNS)
+    for count, row in enumerate(rows, start=1):
+        writer.writerow(row)
+        if count % EXPORT_BATCH_SIZE == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+def _stream_ndjson(rows):
+    lines = []
+    for row in rows:
+        record = dict(zip(EXPORT_COLUMNS, row))
+        record["reportDate"] = record["reportDate"].isoformat()
+        lines.append(json.dumps(record))
+        if len(lines) == EXPORT_BATCH_SIZE:
+            yield "\n".join(lines) + "\n"
+            lines = []
+    if lines:
+        yield "\n".join(lines) + "\n"
+
+@router.get('/daily-sales-reports/export', tags=["Daily Sales"])
+def export_daily_sales_reports(
+    format: Literal['csv', 'ndjson'] = 'csv',
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    retail_partner_id: Optional[int] = None,
+    status: Optional[Literal['submitted', 'pending', 'approved', 'rejected']] = None,
+):
+    """
+    Streams sales line items as CSV or NDJSON, one row per item joined to its
+    report, product, merchandiser and store. Memory use stays constant
+    regardless of the size of the export; archived months are read one month
+    at a time.
+    """
+    rows = _export_rows(start_date, end_date, retail_partner_id, status)
+    if format == 'ndjson':
+        return StreamingResponse(_stream_ndjson(rows), media_type="application/x-ndjson")
+    return StreamingResponse(
+        _stream_csv(rows),
+        media_type="text/csv",
+        headers={"Content-Disposition": 'attachment; filename="daily-sales-export.csv"'},
+    )
 
-@router.post('/daily-sales-reports', response_model=DailySalesReportResponse, status_code=fastapi_status.HTTP_201_CREATED, tags=["Daily Sales"])
-def create_daily_sales_report(req: DailySalesReportCreate, db: Session = Depends(get_db)):
-    """Creates a new daily sales report along with its associated sale items."""
-    # Create the main report object
-    report_db = models.DailySalesReport(
+def _archived_conflict(report_date: date) -> HTTPException:
+    return HTTPException(
+        status_code=fastapi_status.HTTP_409_CONFLICT,
+        detail=f"Sales for {report_date:%Y-%m} are archived and can no longer be changed."
+    )
+
+def _insert_report_statement(req: DailySalesReportCreate):
+    """Inserts the report of `req` (without its items), returning its id."""
+    report_table = models.DailySalesReport.__table__
+    return insert(report_table).values(
         merchandiser_id=req.merchandiser_id,
         retail_partner_id=req.retail_partner_id,
         report_date=req.report_date,
         status=req.status,
         notes=req.notes,
         submitted_at=datetime.utcnow()
-    )
-    # Create and add sale item objects
-    for item_data in req.data:
-        report_db.sales_items.append(models.DailySalesItem(
-            product_id=item_data.product_id,
-            quantity_sold=item_data.quantity_sold,
-            unit_price=item_data.sales_price,
-            discount_percent=item_data.discount_percent
-        ))
+    ).returning(report_table.c.id)
+
+def _item_rows(report_id: int, report_date: date, items: List[DailySalesItemCreate]) -> List[dict]:
+    """`daily_sales_items` rows for the items of one report."""
+    return [
+        {
+            "report_id": report_id,
+            "report_date": report_date,
+            "product_id": item_data.product_id,
+            "quantity_sold": item_data.quantity_sold,
+            "unit_price": item_data.sales_price,
+            "discount_percent": item_data.discount_percent,
+        } for item_data in items
+    ]
 
-    db.add(report_db)
+@router.post('/daily-sales-reports', response_model=DailySalesReportResponse, status_code=fastapi_status.HTTP_201_CREATED, tags=["Daily Sales"])
+def create_daily_sales_report(req: DailySalesReportCreate, db: Session = Depends(get_db)):
+    """Creates a new daily sales report along with its associated sale items."""
+    archive.lock_months(db, [req.report_date])
+    if archive.is_archived(req.report_date):
+        raise _archived_conflict(req.report_date)
+    report_id = db.execute(_insert_report_statement(req)).scalar_one()
+    if req.data:
+        db.execute(insert(models.DailySalesItem.__table__), _item_rows(report_id, req.report_date, req.data))
+    if rollup.counts(req.status):
+        rollup.apply_reports(db, [report_id])
+    if stock.counts(req.status):
+        stock.apply_reports(db, [report_id])
     db.commit()
-    db.refresh(report_db)
-    
-    # Eagerly load relationships needed for the response model
-    db.refresh(report_db, attribute_names=['sales_items', 'merchandiser'])
-    for item in report_db.sales_items:
-        db.refresh(item, attribute_names=['product'])
-        
-    # Manually construct the response to ensure all fields are correctly populated
-    items_response = [
-        DailySalesItemResponse(
-            productId=item.product_id,
-            productName=item.product.name if item.product else "N/A",
-            quantitySold=item.quantity_sold,
-            salesPrice=item.unit_price,
-            discountPercent=item.discount_percent
-        ) for item in report_db.sales_items
-    ]
-    return DailySalesReportResponse(
-        salesId=report_db.id,
-        data=items_response,
-        merchandiserId=report_db.merchandiser_id,
-        merchandiserName=report_db.merchandiser.name if report_db.merchandiser else "Unknown Merchandiser",
-        retailPartnerId=report_db.retail_partner_id,
-        reportDate=report_db.report_date,
-        status=report_db.status,
-        notes=report_db.notes,
-        submittedAt=report_db.submitted_at
-    )
+    if rollup.counts(req.status):
+        catalog_cache.invalidate(catalog_cache.LEADERBOARDS)
+
+    return _load_report_response(db, report_id)
+
+# --- Daily Sales Batch Ingestion ---
+MAX_BATCH_REPORTS = 100
+
+class BatchReportResult(APIBaseModel):
+    """Outcome for one report of a batch upload, in request order."""
+    index: int
+    sales_id: Optional[int] = Field(default=None, alias="salesId")
+    result: Literal['created', 'failed']
+    detail: Optional[str] = None
+
+def _existing_ids(db: Session, model, ids) -> set:
+    """Returns the subset of `ids` that exist as primary keys of `model`."""
+    if not ids:
+        return set()
+    return {row[0] for row in db.query(model.id).filter(model.id.in_(ids)).all()}
+
+@router.post('/daily-sales-reports/batch', response_model=List[BatchReportResult], tags=["Daily Sales"])
+def create_daily_sales_reports_batch(req: List[DailySalesReportCreate], db: Session = Depends(get_db)):
+    """
+    Creates several daily sales reports in one transaction, e.g. when a
+    merchandiser syncs after being offline.
+
+    Reports and items are written with multi-row INSERTs. A report that
+    references an unknown merchandiser, store or product, or that collides with
+    an existing report for the same merchandiser and date, is reported as
+    failed without affecting the rest of the batch.
+    """
+    if len(req) > MAX_BATCH_REPORTS:
+        raise HTTPException(
+            status_code=fastapi_status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"A batch may contain at most {MAX_BATCH_REPORTS} reports."
+        )
+
+    results: List[Optional[BatchReportResult]] = [None] * len(req)
+
+    def fail(index: int, detail: str):
+        results[index] = BatchReportResult(index=index, result='failed', detail=detail)
+
+    # Validate foreign keys up front with one query per table so a bad row can't abort the transaction
+    merchandiser_ids = _existing_ids(db, models.User, {r.merchandiser_id for r in req})
+    partner_ids = _existing_ids(db, models.RetailPartner, {r.retail_partner_id for r in req})
+    product_ids = _existing_ids(db, models.Product, {i.product_id for r in req for i in r.data})
+
+    archive.lock_months(db, [r.report_date for r in req])
+    archived_months = set(archive.archived_months())
+    pending: Dict[Tuple[int, date], int] = {}
+    for index, report in enumerate(req):
+        if report.merchandiser_id not in merchandiser_ids:
+            fail(index, f"Merchandiser {report.merchandiser_id} not found.")
+        elif report.retail_partner_id not in partner_ids:
+            fail(index, f"Retail partner {report.retail_partner_id} not found.")
+        elif any(item.product_id not in product_ids for item in report.data):
+            fail(index, "One or more products not found.")
+        elif partitions.month_start(report.report_date) in archived_months:
+            fail(index, f"Sales for {report.report_date:%Y-%m} are archived and can no longer be changed.")
+        elif (report.merchandiser_id, report.report_date) in pending:
+            fail(index, "Duplicate report for this merchandiser and date within the batch.")
+        else:
+            pending[(report.merchandiser_id, report.report_date)] = index
+
+    if pending:
+        submitted_at = datetime.utcnow()
+        report_rows = [
+            {
+                "merchandiser_id": req[index].merchandiser_id,
+                "retail_partner_id": req[index].retail_partner_id,
+                "report_date": req[index].report_date,
+                "status": req[index].status,
+                "notes": req[index].notes,
+                "submitted_at": submitted_at,
+            } for index in pending.values()
+        ]
+        report_table = models.DailySalesReport.__table__
+        inserted = db.execute(
+            pg_insert(report_table).values(report_rows)
+            .on_conflict_do_nothing(constraint="uix_merch_report_date")
+            .returning(report_table.c.id, report_table.c.merchandiser_id, report_table.c.report_date)
+        ).all()
+
+        item_rows = []
+        for report_id, merchandiser_id, report_date in inserted:
+            index = pending.pop((merchandiser_id, report_date))
+            results[index] = BatchReportResult(index=index, salesId=report_id, result='created')
+            item_rows.extend(_item_rows(report_id, report_date, req[index].data))
+        if item_rows:
+            db.execute(insert(models.DailySalesItem.__table__), item_rows)
+        created = [result for result in results if result is not None and result.sales_id is not None]
+        rolled_up = rollup.apply_reports(db, [r.sales_id for r in created if rollup.counts(req[r.index].status)])
+        stock.apply_reports(db, [r.sales_id for r in created if stock.counts(req[r.index].status)])
+
+        # Rows skipped by ON CONFLICT already exist in the database
+        for index in pending.values():
+            fail(index, "A report for this merchandiser and date already exists.")
+
+        db.commit()
+        if rolled_up:
+            catalog_cache.invalidate(catalog_cache.LEADERBOARDS)
+
+    return results
 
 @router.put('/daily-status',tags=["Daily Sales"])
 def update_daily_status(threadup:UpdateDaiyThreadRequest,db:Session=Depends(get_db)):
-    sales=db.query(models.DailySalesReport).filter(models.DailySalesReport.id==threadup.id).first()
+    # Lock the row and reload it so the rollup sees the status as of the lock
+    sales=db.query(models.DailySalesReport).filter(models.DailySalesReport.id==threadup.id).with_for_update().populate_existing().first()
     if not sales:
         raise HTTPException(status_code=fastapi_status.HTTP_404_NOT_FOUND, detail="sales not found")
+    rolled_up = rollup.apply_status_change(db, sales.id, sales.status, threadup.status)
+    stock.apply_status_change(db, sales.id, sales.status, threadup.status)
     sales.status=threadup.status
     db.commit()
+    if rolled_up:
+        catalog_cache.invalidate(catalog_cache.LEADERBOARDS)
     db.refresh(sales)
     return sales
 
@@ -502,6 +1116,21 @@ class UpdateReportStatusRequest(BaseModel):
 
 
 # --- Add this new endpoint to update a report's status ---
+def _set_status_statement(report_id: int, status: str):
+    """Sets the status of a report, returning its previous status (no row if it does not exist)."""
+    report_table = models.DailySalesReport.__table__
+    # Lock the row and return its previous status so the rollup sees the transition
+    previous = select(report_table.c.id, report_table.c.status).where(
+        report_table.c.id == report_id
+    ).with_for_update().subquery()
+    return update(report_table).where(report_table.c.id == previous.c.id).values(status=status).returning(previous.c.status)
+
+def _report_not_found(report_id: int) -> HTTPException:
+    return HTTPException(
+        status_code=fastapi_status.HTTP_404_NOT_FOUND,
+        detail=f"Sales report with ID {report_id} not found."
+    )
+
 @router.patch('/daily-sales-reports/{report_id}', response_model=DailySalesReportResponse, tags=["Daily Sales"])
 def update_sales_report_status(
     report_id: int,
@@ -511,42 +1140,383 @@ def update_sales_report_status(
     """
     Updates the status of a specific daily sales report to 'approved' or 'rejected'.
     """
-    report_db = db.query(models.DailySalesReport).filter(models.DailySalesReport.id == report_id).first()
+    old_status = db.execute(_set_status_statement(report_id, req.status)).first()
+    if old_status is None:
+        raise _report_not_found(report_id)
+    rolled_up = rollup.apply_status_change(db, report_id, old_status[0], req.status)
+    stock.apply_status_change(db, report_id, old_status[0], req.status)
+    db.commit()
+    if rolled_up:
+        catalog_cache.invalidate(catalog_cache.LEADERBOARDS)
 
-    if not report_db:
+    return _load_report_response(db, report_id)
+
+
+MAX_BULK_STATUS_REPORTS = 1000
+
+class BulkReportStatusRequest(APIBaseModel):
+    """Request model to move many sales reports to the same status."""
+    report_ids: List[int] = Field(alias="reportIds", min_length=1)
+    status: Literal['approved', 'rejected']
+
+class BulkReportStatusResult(APIBaseModel):
+    """Outcome for one report of a bulk status change, in request order."""
+    sales_id: int = Field(alias="salesId")
+    result: Literal['updated', 'unchanged', 'not_found']
+    previous_status: Optional[str] = Field(default=None, alias="previousStatus")
+
+@router.post('/daily-sales-reports/status', response_model=List[BulkReportStatusResult], tags=["Daily Sales"])
+def update_sales_reports_status_bulk(req: BulkReportStatusRequest, db: Session = Depends(get_db)):
+    """
+    Sets the status of several daily sales reports at once, e.g. when an admin
+    approves an end-of-month backlog.
+
+    All reports are updated with one UPDATE ... WHERE id = ANY(...) RETURNING
+    their previous status, and the rollup and inventory are adjusted for every
+    report that changed in one statement each. Unlike the single-report PATCH,
+    the response only carries the per-id outcome, not the report bodies.
+    """
+    report_ids = list(dict.fromkeys(req.report_ids))
+    if len(report_ids) > MAX_BULK_STATUS_REPORTS:
         raise HTTPException(
-            status_code=fastapi_status.HTTP_404_NOT_FOUND,
-            detail=f"Sales report with ID {report_id} not found."
+            status_code=fastapi_status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"A bulk status change may contain at most {MAX_BULK_STATUS_REPORTS} reports."
         )
 
-    # Update the status
-    report_db.status = req.status
+    report_table = models.DailySalesReport.__table__
+    # Lock the rows in id order so overlapping bulk changes queue instead of deadlocking
+    previous = select(report_table.c.id, report_table.c.status).where(
+        report_table.c.id == func.any(cast(report_ids, ARRAY(Integer)))
+    ).order_by(report_table.c.id).with_for_update().subquery()
+    old_statuses = dict(db.execute(
+        update(report_table).where(report_table.c.id == previous.c.id)
+        .values(status=req.status).returning(report_table.c.id, previous.c.status)
+    ).all())
+
+    changed = [report_id for report_id, old in old_statuses.items() if old != req.status]
+    rolled_up = rollup.apply_reports(
+        db, [i for i in changed if rollup.counts(old_statuses[i]) != rollup.counts(req.status)],
+        sign=1 if rollup.counts(req.status) else -1,
+    )
+    stock.apply_reports(
+        db, [i for i in changed if stock.counts(old_statuses[i]) != stock.counts(req.status)],
+        sign=-1 if stock.counts(req.status) else 1,
+    )
     db.commit()
-    db.refresh(report_db)
+    if rolled_up:
+        catalog_cache.invalidate(catalog_cache.LEADERBOARDS)
 
-    # --- Manually construct the response (copied from your GET endpoint) ---
-    # This is needed because the response model has computed fields and specific structures.
-    db.refresh(report_db, attribute_names=['sales_items', 'merchandiser'])
-    for item in report_db.sales_items:
-        db.refresh(item, attribute_names=['product'])
+    results = []
+    for report_id in report_ids:
+        if report_id not in old_statuses:
+            results.append(BulkReportStatusResult(salesId=report_id, result='not_found'))
+        else:
+            old = old_statuses[report_id]
+            results.append(BulkReportStatusResult(
+                salesId=report_id, result='updated' if old != req.status else 'unchanged', previousStatus=old
+            ))
+    return results
 
-    items_response = [
-        DailySalesItemResponse(
-            productId=item.product_id,
-            productName=item.product.name if item.product else "N/A",
-            quantitySold=item.quantity_sold,
-            salesPrice=item.unit_price,
-            discountPercent=item.discount_percent
-        ) for item in report_db.sales_items
+
+# ==============================================================================
+# 6. ANALYTICS RESOURCE
+# ==============================================================================
+
+# --- Analytics Pydantic Models ---
+class SalesTimeseriesPoint(APIBaseModel):
+    """Sales totals for one time bucket."""
+    period: date
+    quantity: int
+    gross_value: float = Field(alias="grossValue")
+    net_value: float = Field(alias="netValue")
+
+# --- Analytics Endpoints ---
+@router.get('/analytics/timeseries', response_model=List[SalesTimeseriesPoint], tags=["Analytics"])
+def get_sales_timeseries(
+    db: Session = Depends(get_db),
+    bucket: Literal['day', 'week', 'month'] = 'day',
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    retail_partner_id: Optional[int] = None,
+    product_id: Optional[int] = None,
+    category: Optional[str] = None,
+    merchandiser_id: Optional[int] = None,
+    status: Optional[Literal['submitted', 'pending', 'approved', 'rejected']] = None,
+):
+    """
+    Returns quantity, gross and net value per day, week (starting Monday) or
+    month, oldest first, for drawing trend charts.
+
+    Optional filters: `start_date`/`end_date` (inclusive report dates),
+    `retail_partner_id`, `product_id`, product `category`, `merchandiser_id` and
+    report `status` (all statuses by default). Buckets without sales are
+    omitted. Net value applies each line's discount, as in the report totals.
+
+    Computed in one grouped query. Approved-only series that don't filter by
+    merchandiser are read from the pre-aggregated daily_sales_rollup table
+    instead of the raw items; other series add the archived months they reach.
+    """
+    if start_date is not None and end_date is not None and start_date > end_date:
+        raise HTTPException(
+            status_code=fastapi_status.HTTP_400_BAD_REQUEST,
+            detail="start_date must not be after end_date."
+        )
+
+    use_rollup = merchandiser_id is None and (status,) == rollup.ROLLUP_STATUSES
+    if use_rollup:
+        source = models.DailySalesRollup
+        report_date = source.report_date
+        date_columns = [report_date]
+        quantity, gross, net = source.quantity, source.gross_value, source.net_value
+        query = select().select_from(source)
+        partner_column, product_column = source.retail_partner_id, source.product_id
+    else:
+        report, item = models.DailySalesReport, models.DailySalesItem
+        report_date = report.report_date
+        # Both sides so each table's partitions are pruned
+        date_columns = [report_date, item.report_date]
+        quantity = item.quantity_sold
+        gross, net = rollup.line_values()
+        query = select().select_from(item).join(
+            report, (report.id == item.report_id) & (report.report_date == item.report_date)
+        )
+        partner_column, product_column = report.retail_partner_id, item.product_id
+        if merchandiser_id is not None:
+            query = query.where(report.merchandiser_id == merchandiser_id)
+        if status is not None:
+            query = query.where(report.status == status)
+
+    if start_date is not None:
+        query = query.where(*(column >= start_date for column in date_columns))
+    if end_date is not None:
+        query = query.where(*(column <= end_date for column in date_columns))
+    if retail_partner_id is not None:
+        query = query.where(partner_column == retail_partner_id)
+    if product_id is not None:
+        query = query.where(product_column == product_id)
+    if category is not None:
+        query = query.join(models.Product, models.Product.id == product_column).where(models.Product.category == category)
+
+    # Inline the unit so the grouped and selected expressions are identical on every driver
+    unit = literal(bucket, literal_execute=True)
+    period = cast(func.date_trunc(unit, cast(report_date, DateTime)), Date).label("period")
+    rows = db.execute(
+        query.add_columns(
+            period,
+            func.coalesce(func.sum(quantity), 0),
+            func.coalesce(func.sum(gross), 0),
+            func.coalesce(func.sum(net), 0),
+        ).group_by(period).order_by(period)
+    ).all()
+    points = {row[0]: list(row[1:]) for row in rows}
+
+    # The rollup keeps archived months; raw series read them from the archive
+    if not use_rollup and archive.months_between(start_date, end_date):
+        product_ids = [product_id] if product_id is not None else None
+        if category is not None:
+            product_ids = [
+                pid for pid in db.scalars(select(models.Product.id).where(models.Product.category == category))
+                if product_id is None or pid == product_id
+            ]
+        for total in archive.totals(
+            start_date, end_date, ["report_date"], merchandiser_id=merchandiser_id, retail_partner_id=retail_partner_id,
+            statuses=[status] if status is not None else None, product_ids=product_ids,
+        ):
+            day = total["report_date"]
+            bucket_start = {'day': day, 'week': day - timedelta(days=day.weekday()), 'month': day.replace(day=1)}[bucket]
+            point = points.setdefault(bucket_start, [0, 0, 0])
+            point[0] += total["quantity"]
+            point[1] += total["gross_value"]
+            point[2] += total["net_value"]
+
+    return [
+        SalesTimeseriesPoint(period=period, quantity=quantity, grossValue=round(float(gross), 2), netValue=round(float(net), 2))
+        for period, (quantity, gross, net) in sorted(points.items())
     ]
-    return DailySalesReportResponse(
-        salesId=report_db.id,
-        data=items_response,
-        merchandiserId=report_db.merchandiser_id,
-        merchandiserName=report_db.merchandiser.name if report_db.merchandiser else "Unknown Merchandiser",
-        retailPartnerId=report_db.retail_partner_id,
-        reportDate=report_db.report_date,
-        status=report_db.status,
-        notes=report_db.notes,
-        submittedAt=report_db.submitted_at
-    )
\ No newline at end of file
+
+# --- Leaderboards ---
+# Closed windows are memoized until a report enters or leaves the approved state.
+# Only a shared cache sees other workers' invalidations, so the long TTL needs
+# CATALOG_CACHE_URL; per-process entries keep the catalog TTL.
+LEADERBOARD_CACHE_TTL = float(os.getenv("LEADERBOARD_CACHE_TTL", "86400"))
+DEFAULT_LEADERBOARD_DAYS = 30
+MAX_LEADERBOARD_SIZE = 100
+
+class LeaderboardEntry(APIBaseModel):
+    """One ranked product, store or merchandiser, optionally within a group."""
+    rank: int
+    id: int
+    name: str
+    group_id: Optional[Union[int, str]] = Field(default=None, alias="groupId")
+    group: Optional[str] = None
+    quantity: int
+    gross_value: float = Field(alias="grossValue")
+    net_value: float = Field(alias="netValue")
+
+def _archived_merchandiser_totals(
+    db: Session, partition: Optional[str], start_date: date, end_date: date
+) -> List[tuple]:
+    """Approved totals per merchandiser (and store or category) in the archived months of the window."""
+    group_key = {'store': 'retail_partner_id', 'category': 'product_id'}.get(partition)
+    totals = archive.totals(
+        start_date, end_date, ["merchandiser_id", *([group_key] if group_key else [])], statuses=rollup.ROLLUP_STATUSES
+    )
+    if partition == 'category':
+        categories = dict(db.execute(select(models.Product.id, models.Product.category).where(
+            models.Product.id.in_({total["product_id"] for total in totals})
+        )).all())
+        # Products that no longer exist drop out, as in the joined query
+        totals = [dict(total, category=categories[total["product_id"]]) for total in totals if total["product_id"] in categories]
+        group_key = 'category'
+
+    merged: Dict[tuple, list] = {}
+    for total in totals:
+        entry = merged.setdefault((total["merchandiser_id"], *([total[group_key]] if group_key else [])), [0, 0, 0])
+        entry[0] += total["quantity"]
+        entry[1] += total["gross_value"]
+        entry[2] += total["net_value"]
+    return [(*key, *entry) for key, entry in merged.items()]
+
+def _leaderboard(
+    db: Session,
+    subject: str,
+    partition: Optional[str],
+    start_date: date,
+    end_date: date,
+    limit: int,
+) -> List[LeaderboardEntry]:
+    """
+    Ranks `subject` by approved net value over the window with rank() over
+    (partition by the store or category), keeping the top `limit` per partition.
+    """
+    if subject == 'merchandisers':
+        report, item = models.DailySalesReport, models.DailySalesItem
+        gross, net = rollup.line_values()
+        quantity = item.quantity_sold
+        store_column, product_column = report.retail_partner_id, item.product_id
+        subject_column = report.merchandiser_id
+        base = select().select_from(item).join(
+            report, (report.id == item.report_id) & (report.report_date == item.report_date)
+        ).where(
+            report.status.in_(rollup.ROLLUP_STATUSES),
+            report.report_date.between(start_date, end_date),
+            item.report_date.between(start_date, end_date),
+        )
+    else:
+        source = models.DailySalesRollup
+        gross, net, quantity = source.gross_value, source.net_value, source.quantity
+        store_column, product_column = source.retail_partner_id, source.product_id
+        subject_column = product_column if subject == 'products' else store_column
+        base = select().select_from(source).where(source.report_date.between(start_date, end_date))
+
+    keys = [subject_column]
+    if partition == 'store':
+        keys.append(store_column)
+    elif partition == 'category':
+        base = base.join(models.Product, models.Product.id == product_column)
+        keys.append(models.Product.category)
+
+    key_names = ["subject_id", "group_id"][:len(keys)]
+    totals = base.add_columns(
+        *[key.label(name) for key, name in zip(keys, key_names)],
+        func.sum(quantity).label("quantity"),
+        func.sum(gross).label("gross_value"),
+        func.sum(net).label("net_value"),
+    ).group_by(*keys)
+    # Merchandisers are ranked from raw items; add the archived months of the window
+    archived = _archived_merchandiser_totals(db, partition, start_date, end_date) if subject == 'merchandisers' else []
+    if archived:
+        key_types = [Integer, Text if partition == 'category' else Integer][:len(keys)]
+        archived_rows = values(
+            *[column(name, key_type) for name, key_type in zip(key_names, key_types)],
+            column("quantity", Integer), column("gross_value", Numeric), column("net_value", Numeric),
+            name="archived",
+        ).data(archived)
+        combined = union_all(totals, select(archived_rows)).subquery("combined")
+        totals = select(
+            *[combined.c[name] for name in key_names],
+            func.sum(combined.c.quantity).label("quantity"),
+            func.sum(combined.c.gross_value).label("gross_value"),
+            func.sum(combined.c.net_value).label("net_value"),
+        ).group_by(*[combined.c[name] for name in key_names])
+    totals = totals.subquery("totals")
+
+    partition_by = totals.c.group_id if partition else None
+    ranked = select(
+        totals,
+        func.rank().over(partition_by=partition_by, order_by=totals.c.net_value.desc()).label("rank"),
+    ).subquery("ranked")
+
+    subject_model = {
+        'products': models.Product, 'stores': models.RetailPartner, 'merchandisers': models.User,
+    }[subject]
+    query = select(ranked, subject_model.name.label("name")).join(
+        subject_model, subject_model.id == ranked.c.subject_id
+    )
+    if partition == 'store':
+        group_store = aliased(models.RetailPartner)
+        query = query.add_columns(group_store.name.label("group_name")).join(
+            group_store, group_store.id == ranked.c.group_id
+        )
+    rows = db.execute(
+        query.where(ranked.c.rank <= limit).order_by(
+            *([ranked.c.group_id] if partition else []), ranked.c.rank, ranked.c.subject_id
+        )
+    ).all()
+
+    return [
+        LeaderboardEntry(
+            rank=row.rank,
+            id=row.subject_id,
+            name=row.name,
+            groupId=row.group_id if partition else None,
+            group=(row.group_name if partition == 'store' else row.group_id) if partition else None,
+            quantity=row.quantity,
+            grossValue=round(float(row.gross_value), 2),
+            netValue=round(float(row.net_value), 2),
+        ) for row in rows
+    ]
+
+@router.get('/analytics/leaderboards/{subject}', response_model=List[LeaderboardEntry], tags=["Analytics"])
+def get_leaderboard(
+    subject: Literal['products', 'stores', 'merchandisers'],
+    db: Session = Depends(get_db),
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    partition: Optional[Literal['store', 'category']] = None,
+    limit: int = Query(10, ge=1, le=MAX_LEADERBOARD_SIZE),
+):
+    """
+    Top `limit` products, stores or merchandisers by net value of approved
+    reports between `start_date` and `end_date` (inclusive; the last 30 days up
+    to today by default). Ties share a rank.
+
+    With `partition=store` or `partition=category` the ranking restarts within
+    each store or product category, e.g. best sellers per store; `group` and
+    `groupId` name the partition. Stores can only be partitioned by category.
+
+    Windows that end before today are closed: their result is cached and only
+    recomputed after a report's approval state changes (with a per-process
+    cache, also after CATALOG_CACHE_TTL).
+    """
+    end_date = end_date or date.today()
+    start_date = start_date or end_date - timedelta(days=DEFAULT_LEADERBOARD_DAYS - 1)
+    if start_date > end_date:
+        raise HTTPException(
+            status_code=fastapi_status.HTTP_400_BAD_REQUEST,
+            detail="start_date must not be after end_date."
+        )
+    if subject == 'stores' and partition == 'store':
+        raise HTTPException(
+            status_code=fastapi_status.HTTP_400_BAD_REQUEST,
+            detail="Stores can only be partitioned by category."
+        )
+
+    def build():
+        return _leaderboard(db, subject, partition, start_date, end_date, limit)
+
+    if end_date >= date.today():
+        return build()
+    key = f"{subject}:{partition}:{start_date.isoformat()}:{end_date.isoformat()}:{limit}"
+    ttl = LEADERBOARD_CACHE_TTL if catalog_cache.is_shared() else None
+    return catalog_cache.cached_json_response(catalog_cache.LEADERBOARDS, key, build, ttl=ttl)
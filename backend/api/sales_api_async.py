@@ -0,0 +1,149 @@
+"""
+Async variant of the /sales router, enabled with DB_ASYNC=true.
+
+The hot routes (listing, creating and approving daily sales reports) are
+`async def` handlers that await their queries on an `AsyncSession` on asyncpg,
+so a request waiting on the database holds no threadpool thread. They execute
+the same statements as `sales_api`, which builds them in shared helpers, and
+have the same paths, parameters and response models.
+
+Every other route is the `sales_api` handler itself: a plain `def` that FastAPI
+runs in the threadpool with a sync session, as without DB_ASYNC. Reads served
+from the Parquet archive also go to the threadpool, since pyarrow blocks.
+
+`benchmarks/concurrent_load.py` compares the two stacks; see
+`benchmarks/results/concurrent_load.md`.
+"""
+from datetime import date
+from typing import List, Optional, Literal, Union
+
+from fastapi import APIRouter, Depends, Query
+from fastapi import status as fastapi_status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import models
+from api import catalog_cache, sales_api
+from api.sales_api import (
+    DailySalesReportCreate, DailySalesReportPage, DailySalesReportResponse, DailySalesReportSummaryPage,
+    DailySalesReportSummaryResponse, UpdateReportStatusRequest, MAX_REPORTS_PAGE_SIZE,
+)
+from db import archive, rollup, stock
+from db.database import get_async_db
+from db.session import SessionLocal
+
+# --- Router Setup ---
+router = APIRouter(prefix="/sales")
+
+
+def _in_threadpool(handler, **kwargs):
+    """Runs a sync `sales_api` handler with its own session in the threadpool."""
+    def call():
+        with SessionLocal() as db:
+            return handler(db=db, **kwargs)
+    return run_in_threadpool(call)
+
+
+async def _load_report_response(db: AsyncSession, report_id: int) -> Optional[DailySalesReportResponse]:
+    """Loads a single report with everything needed for `DailySalesReportResponse`."""
+    report = (await db.scalars(sales_api._report_statement(report_id))).first()
+    return sales_api._report_response(report) if report else None
+
+# ==============================================================================
+# DAILY SALES RESOURCE
+# ==============================================================================
+
+@router.get(
+    '/daily-sales-reports',
+    response_model=Union[
+        List[DailySalesReportResponse], List[DailySalesReportSummaryResponse],
+        DailySalesReportPage, DailySalesReportSummaryPage,
+    ],
+    tags=["Daily Sales"],
+)
+async def get_daily_sales_reports(
+    db: AsyncSession = Depends(get_async_db),
+    status: Optional[Literal['submitted', 'pending', 'approved', 'rejected']] = None,
+    merchandiser_id: Optional[int] = None,
+    retail_partner_id: Optional[int] = None,
+    report_date: Optional[date] = None,
+    saleid: Optional[int] = None,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_REPORTS_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    view: Literal['full', 'summary'] = 'full',
+):
+    """Retrieves daily sales reports, newest first. See `sales_api.get_daily_sales_reports`."""
+    if report_date is not None and archive.is_archived(report_date):
+        return await _in_threadpool(
+            sales_api.get_daily_sales_reports, status=status, merchandiser_id=merchandiser_id,
+            retail_partner_id=retail_partner_id, report_date=report_date, saleid=saleid,
+            limit=limit, cursor=cursor, view=view,
+        )
+
+    limit = sales_api._page_limit(limit, cursor)
+    reports_db, next_cursor = sales_api._reports_page((await db.scalars(sales_api._reports_statement(
+        status, merchandiser_id, retail_partner_id, report_date, saleid, limit, cursor, view
+    ))).all(), limit)
+    totals = {}
+    if view == 'summary' and reports_db:
+        totals = sales_api._report_totals_by_id(
+            (await db.execute(sales_api._report_totals_statement([report.id for report in reports_db]))).all()
+        )
+    return sales_api._reports_listing(view, reports_db, totals, limit is not None, next_cursor)
+
+@router.post('/daily-sales-reports', response_model=DailySalesReportResponse, status_code=fastapi_status.HTTP_201_CREATED, tags=["Daily Sales"])
+async def create_daily_sales_report(req: DailySalesReportCreate, db: AsyncSession = Depends(get_async_db)):
+    """Creates a new daily sales report along with its associated sale items."""
+    for stmt in archive.lock_statements([req.report_date]):
+        await db.execute(stmt)
+    if archive.is_archived(req.report_date):
+        raise sales_api._archived_conflict(req.report_date)
+    report_id = (await db.execute(sales_api._insert_report_statement(req))).scalar_one()
+    if req.data:
+        await db.execute(
+            insert(models.DailySalesItem.__table__), sales_api._item_rows(report_id, req.report_date, req.data)
+        )
+    if rollup.counts(req.status):
+        for stmt in rollup.apply_statements([report_id]):
+            await db.execute(stmt)
+    if stock.counts(req.status):
+        await db.execute(stock.apply_statement([report_id]))
+    await db.commit()
+    if rollup.counts(req.status):
+        catalog_cache.invalidate(catalog_cache.LEADERBOARDS)
+
+    return await _load_report_response(db, report_id)
+
+@router.patch('/daily-sales-reports/{report_id}', response_model=DailySalesReportResponse, tags=["Daily Sales"])
+async def update_sales_report_status(
+    report_id: int,
+    req: UpdateReportStatusRequest,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Updates the status of a specific daily sales report to 'approved' or 'rejected'."""
+    old_status = (await db.execute(sales_api._set_status_statement(report_id, req.status))).first()
+    if old_status is None:
+        raise sales_api._report_not_found(report_id)
+    old_status = old_status[0]
+    rolled_up = rollup.counts(old_status) != rollup.counts(req.status)
+    if rolled_up:
+        for stmt in rollup.apply_statements([report_id], sign=1 if rollup.counts(req.status) else -1):
+            await db.execute(stmt)
+    if stock.counts(old_status) != stock.counts(req.status):
+        await db.execute(stock.apply_statement([report_id], sign=-1 if stock.counts(req.status) else 1))
+    await db.commit()
+    if rolled_up:
+        catalog_cache.invalidate(catalog_cache.LEADERBOARDS)
+
+    return await _load_report_response(db, report_id)
+
+# ==============================================================================
+# EVERYTHING ELSE
+# ==============================================================================
+
+# The sync handlers, in their original order, for every route not defined above
+_ASYNC_ROUTES = {(method, route.path) for route in router.routes for method in route.methods}
+for _route in sales_api.router.routes:
+    if not any((method, _route.path) in _ASYNC_ROUTES for method in _route.methods):
+        router.routes.append(_route)
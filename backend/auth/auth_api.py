@@ -1,19 +1,24 @@
+import csv
+import io
 from datetime import datetime, timedelta, timezone # Added timezone
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, File, HTTPException, UploadFile, status
+from sqlalchemy import insert
 import models # Assuming models.User has id, name, password_hash, role attributes
 # from passlib.context import CryptContext # Removed: bcrypt_context imported from .security
 from jose import JWTError, jwt
 from fastapi.security import OAuth2PasswordRequestForm # OAuth2PasswordBearer is Oauth2_b from .security
 from db.database import get_db
-from .auth_schemas import CreateUserModel, CreateUserResponseModel, Token
+from api import catalog_cache
+from .auth_schemas import BulkUserResult, CreateUserModel, CreateUserResponseModel, Principal, Token
 from sqlalchemy.orm import Session
 import sqlalchemy.exc # Added for specific exception handling
 from pydantic import BaseModel
-from .security import bcrypt_context, Oauth2_b # Oauth2_b is OAuth2PasswordBearer instance
+from .security import Oauth2_b # Oauth2_b is OAuth2PasswordBearer instance
 from dotenv import load_dotenv
 import os
-from .auth_controller import get_current_user, create_access_token, authenticate_user
+from .hashing import hash_password, hash_passwords
+from .auth_controller import get_current_user, get_current_principal, get_current_admin, create_access_token, authenticate_user
 
 load_dotenv() # Best to call this once at app startup
 
@@ -65,15 +70,15 @@ def create_user_merchandiser(user_data: CreateUserModel, db: Session = Depends(g
     if user_exists:
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=f"User '{user_data.username}' already exists")
     retail=db.query(models.RetailPartner).filter_by(id=user_data.retail_partner_id).first()
-    print(retail.name)
-    hashed_pass = bcrypt_context.hash(user_data.password)
     if not retail:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="retail partner not found")
+    hashed_pass = hash_password(user_data.password)
     new_user = models.User(name=user_data.username, password_hash=hashed_pass, role='merchandiser', retail_partner=retail)
     
     try:
         db.add(new_user)
         db.commit()
+        catalog_cache.invalidate(catalog_cache.RETAIL_PARTNERS) # partner responses list their merchandisers
         db.refresh(new_user)
     except sqlalchemy.exc.SQLAlchemyError as e:
         db.rollback()
@@ -88,8 +93,96 @@ def create_user_merchandiser(user_data: CreateUserModel, db: Session = Depends(g
     return CreateUserResponseModel(id=new_user.id, username=new_user.name, role=new_user.role)
 
 
+MAX_BULK_USERS = 5000
+
+def _provision_merchandisers(rows: List[CreateUserModel], db: Session) -> List[BulkUserResult]:
+    """
+    Creates merchandisers in bulk: one query for name collisions, one for retail
+    partners, parallel hashing, and one multi-row INSERT. Invalid rows are
+    reported as failed; the rest are created.
+    """
+    if len(rows) > MAX_BULK_USERS:
+        raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=f"At most {MAX_BULK_USERS} users per request")
+
+    names = {row.username for row in rows}
+    taken = {name for (name,) in db.query(models.User.name).filter(models.User.name.in_(names)).all()} if names else set()
+    partner_ids = {row.retail_partner_id for row in rows if row.retail_partner_id is not None}
+    partners = {pid for (pid,) in db.query(models.RetailPartner.id).filter(models.RetailPartner.id.in_(partner_ids)).all()} if partner_ids else set()
+
+    results: List[BulkUserResult] = [None] * len(rows)
+    valid = []
+    for index, row in enumerate(rows):
+        detail = None
+        if not row.username or not row.password:
+            detail = "username and password are required"
+        elif row.username in taken:
+            detail = f"User '{row.username}' already exists"
+        elif row.retail_partner_id not in partners:
+            detail = "retail partner not found"
+        if detail:
+            results[index] = BulkUserResult(index=index, username=row.username, result='failed', detail=detail)
+        else:
+            taken.add(row.username) # later duplicates within the request fail
+            valid.append(index)
+
+    if valid:
+        hashes = hash_passwords([rows[i].password for i in valid])
+        user_table = models.User.__table__
+        try:
+            inserted = db.execute(
+                insert(user_table).values([
+                    {
+                        "name": rows[i].username,
+                        "password_hash": hashed,
+                        "role": "merchandiser",
+                        "retail_partner_id": rows[i].retail_partner_id,
+                        "created_at": datetime.now(timezone.utc),
+                    } for i, hashed in zip(valid, hashes)
+                ]).returning(user_table.c.id, user_table.c.name)
+            ).all()
+            db.commit()
+            catalog_cache.invalidate(catalog_cache.RETAIL_PARTNERS)
+        except sqlalchemy.exc.SQLAlchemyError as e:
+            db.rollback()
+            raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Error occurred while creating users.") from e
+        ids = {name: user_id for user_id, name in inserted}
+        for i in valid:
+            results[i] = BulkUserResult(index=i, username=rows[i].username, id=ids[rows[i].username], result='created')
+    return results
+
+
+@router.post("/merchandisers/bulk", response_model=List[BulkUserResult])
+def bulk_create_merchandisers(
+    users: List[CreateUserModel],
+    db: Session = Depends(get_db),
+    admin: Principal = Depends(get_current_admin),
+):
+    """Creates many merchandisers at once from a JSON list. Admins only."""
+    return _provision_merchandisers(users, db)
+
+
+@router.post("/merchandisers/bulk-csv", response_model=List[BulkUserResult])
+def bulk_create_merchandisers_csv(
+    file: UploadFile = File(...),
+    db: Session = Depends(get_db),
+    admin: Principal = Depends(get_current_admin),
+):
+    """Creates many merchandisers at once from a CSV with columns username,password,retail_partner_id. Admins only."""
+    try:
+        reader = csv.DictReader(io.TextIOWrapper(file.file, encoding="utf-8-sig"))
+        users = []
+        for row in reader:
+            fields = {"username": (row.get("username") or "").strip(), "password": row.get("password") or ""}
+            if (row.get("retail_partner_id") or "").strip():
+                fields["retail_partner_id"] = int(row["retail_partner_id"])
+            users.append(CreateUserModel(**fields))
+    except (ValueError, KeyError, UnicodeDecodeError) as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid CSV: {e}")
+    return _provision_merchandisers(users, db)
+
+
 @router.get("/", response_model=List[CreateUserResponseModel]) 
-def all_users(db: Session = Depends(get_db), current_user: models.User = Depends(get_current_user)):
+def all_users(db: Session = Depends(get_db), current_user: Principal = Depends(get_current_principal)):
     # 'current_user' can be used here if you need to check roles/permissions for listing all users
     # For example:
     # if current_user.role != "admin":
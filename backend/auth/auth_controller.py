@@ -4,7 +4,10 @@ import models
 from jose import JWTError, jwt
 from db.database import get_db
 from sqlalchemy.orm import Session
-from .security import bcrypt_context, Oauth2_b
+from .security import Oauth2_b
+from .auth_schemas import Principal
+from .principal_cache import principal_cache
+from .hashing import verify_password
 from dotenv import load_dotenv
 import os
 
@@ -17,7 +20,7 @@ def authenticate_user(username: str, password: str, db: Session) -> models.User
     user = db.query(models.User).filter_by(name=username).first()
     if not user:
         return False
-    if not bcrypt_context.verify(password, user.password_hash):
+    if not verify_password(password, user.password_hash):
         return False
     return user
 
@@ -49,4 +52,43 @@ def get_current_user(token: str = Depends(Oauth2_b), db: Session = Depends(get_d
             raise credentials_exception
         return user
     except JWTError:
-        raise credentials_exception
\ No newline at end of file
+        raise credentials_exception
+
+
+def get_current_principal(token: str = Depends(Oauth2_b), db: Session = Depends(get_db)) -> Principal:
+    """
+    Like `get_current_user`, but returns only identity and role and serves them
+    from `principal_cache`, so most requests don't query the users table.
+    """
+    credentials_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+    try:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    except JWTError:
+        raise credentials_exception
+    username: str | None = payload.get('sub')
+    user_id: int | None = payload.get('user_id')
+    if username is None or user_id is None:
+        raise credentials_exception
+
+    principal = principal_cache.get(user_id)
+    if principal is None:
+        user = db.query(models.User).filter(models.User.id == user_id).first()
+        if user is None:
+            raise credentials_exception
+        principal = Principal.model_validate(user)
+        principal_cache.put(principal)
+    # A renamed user's old tokens stop working, as with get_current_user
+    if principal.name != username:
+        raise credentials_exception
+    return principal
+
+
+def get_current_admin(principal: Principal = Depends(get_current_principal)) -> Principal:
+    """`get_current_principal`, restricted to admins."""
+    if principal.role != 'admin':
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin access required")
+    return principal
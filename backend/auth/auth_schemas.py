@@ -1,3 +1,4 @@
+from typing import Literal, Optional
 from pydantic import BaseModel
 
 class CreateUserModel(BaseModel):
@@ -17,3 +18,20 @@ class CreateUserResponseModel(BaseModel):
 class Token(BaseModel):
     access_token: str
     token_type: str
+
+class Principal(BaseModel):
+    """The authenticated caller: identity and role, without the full user row."""
+    id: int
+    name: str
+    role: str
+    retail_partner_id: Optional[int] = None
+    class Config:
+        from_attributes = True
+
+class BulkUserResult(BaseModel):
+    """Outcome for one row of a bulk provisioning request, in request order."""
+    index: int
+    username: str
+    id: Optional[int] = None
+    result: Literal['created', 'failed']
+    detail: Optional[str] = None
@@ -0,0 +1,98 @@
+"""
+Password hashing off the request threads.
+
+bcrypt runs in a dedicated process pool so a burst of logins doesn't hold the
+GIL or the Starlette threadpool. The number of hashing jobs in flight is bounded
+(workers + PASSWORD_HASH_QUEUE_LIMIT); beyond that, callers get a 503 instead of
+queueing behind the burst. Every job in flight holds a request thread while it
+waits, so the bound is capped at half of Starlette's threadpool. Set
+PASSWORD_HASH_WORKERS=0 to hash inline.
+
+Bulk hashing takes one of the same slots per request and runs on its own,
+smaller pool (PASSWORD_HASH_BULK_WORKERS), so provisioning a few thousand users
+can't occupy the workers that logins wait on.
+"""
+import multiprocessing
+import os
+import threading
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor
+
+from fastapi import HTTPException, status
+
+from .security import bcrypt_context
+
+THREADPOOL_SIZE = 40  # Starlette's default threadpool (anyio's thread limiter)
+
+HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", "4"))
+HASH_QUEUE_LIMIT = min(
+    int(os.getenv("PASSWORD_HASH_QUEUE_LIMIT", "16")),
+    THREADPOOL_SIZE // 2 - max(HASH_WORKERS, 1),
+)
+BULK_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_BULK_WORKERS", str(max(HASH_WORKERS // 2, 1))))
+
+_executors = {}
+_executor_lock = threading.Lock()
+_slots = threading.BoundedSemaphore(max(HASH_WORKERS, 1) + HASH_QUEUE_LIMIT)
+
+
+def _hash(password: str) -> str:
+    return bcrypt_context.hash(password)
+
+
+def _verify(password: str, password_hash: str) -> bool:
+    return bcrypt_context.verify(password, password_hash)
+
+
+def _get_executor(bulk: bool = False) -> ProcessPoolExecutor:
+    with _executor_lock:
+        if bulk not in _executors:
+            # spawn, not fork: the server process is multi-threaded
+            _executors[bulk] = ProcessPoolExecutor(
+                max_workers=BULK_HASH_WORKERS if bulk else HASH_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _executors[bulk]
+
+
+@contextmanager
+def _slot():
+    if not _slots.acquire(blocking=False):
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many concurrent password operations, please retry.",
+            headers={"Retry-After": "1"},
+        )
+    try:
+        yield
+    finally:
+        _slots.release()
+
+
+def _run(fn, *args):
+    with _slot():
+        if HASH_WORKERS <= 0:
+            return fn(*args)
+        return _get_executor().submit(fn, *args).result()
+
+
+def hash_password(password: str) -> str:
+    """Hashes a password in the hashing pool. Raises a 503 HTTPException when saturated."""
+    return _run(_hash, password)
+
+
+def verify_password(password: str, password_hash: str) -> bool:
+    """Verifies a password in the hashing pool. Raises a 503 HTTPException when saturated."""
+    return _run(_verify, password, password_hash)
+
+
+def hash_passwords(passwords: list) -> list:
+    """
+    Hashes many passwords in parallel on the bulk hashing pool, e.g. for bulk
+    provisioning. Raises a 503 HTTPException when saturated.
+    """
+    with _slot():
+        if HASH_WORKERS <= 0:
+            return [_hash(p) for p in passwords]
+        chunksize = max(1, len(passwords) // (BULK_HASH_WORKERS * 4))
+        return list(_get_executor(bulk=True).map(_hash, passwords, chunksize=chunksize))
@@ -0,0 +1,90 @@
+"""
+Concurrent load benchmark against a running server.
+
+Fires `--requests` GETs at each path with `--concurrency` requests in flight and
+reports requests per second and latency percentiles. To compare the sync and
+async database stacks, run it once against each:
+
+    DB_ASYNC=false uvicorn main:app --port 8000 --workers 1
+    python -m benchmarks.concurrent_load --url http://localhost:8000
+
+    DB_ASYNC=true uvicorn main:app --port 8000 --workers 1
+    python -m benchmarks.concurrent_load --url http://localhost:8000
+
+Measured numbers are in `benchmarks/results/concurrent_load.md`.
+
+Requires httpx.
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+
+import httpx
+
+DEFAULT_PATHS = [
+    "/sales/products",
+    "/sales/daily-sales-reports?limit=50",
+    "/sales/daily-sales-reports?limit=50&view=summary",
+    "/sales/inventory/summary",
+]
+
+
+async def _run_path(client: httpx.AsyncClient, path: str, total: int, concurrency: int) -> dict:
+    latencies = []
+    errors = 0
+    remaining = iter(range(total))
+
+    async def worker():
+        nonlocal errors
+        for _ in remaining:
+            start = time.perf_counter()
+            response = await client.get(path)
+            latencies.append(time.perf_counter() - start)
+            if response.status_code >= 400:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "path": path,
+        "requests": total,
+        "concurrency": concurrency,
+        "errors": errors,
+        "rps": round(total / elapsed, 1),
+        "p50_ms": round(statistics.median(latencies) * 1000, 2),
+        "p95_ms": round(latencies[int(len(latencies) * 0.95) - 1] * 1000, 2),
+    }
+
+
+async def run(url: str, paths, total: int, concurrency: int) -> list:
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=60) as client:
+        return [await _run_path(client, path, total, concurrency) for path in paths]
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Concurrent load benchmark against a running server.")
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--path", action="append", dest="paths", help="path to hit (repeatable)")
+    parser.add_argument("--requests", type=int, default=2000, help="requests per path")
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--json", dest="json_path", help="also write results to this file")
+    args = parser.parse_args(argv)
+
+    results = asyncio.run(run(args.url, args.paths or DEFAULT_PATHS, args.requests, args.concurrency))
+    for r in results:
+        print(f"{r['path']:<55} {r['rps']:>8} req/s  p50 {r['p50_ms']:>7} ms  p95 {r['p95_ms']:>7} ms  errors {r['errors']}")
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,241 @@
+"""
+Synthetic data generator for the benchmark suite.
+
+Fills every table in `models/` at a configurable scale: retail partners, the
+product catalog, per-store inventory, merchandisers (plus one admin), one
+report per merchandiser per day of history with a handful of items each, an
+audit log entry per reviewed report, and the daily_sales_rollup built from the
+approved reports. Generation is seeded, so the same arguments give the same
+data. All users share `password`, so login can be benchmarked.
+
+Rows are written with multi-row INSERTs in chunks; the generator is meant for an
+empty, disposable database:
+
+    python -m benchmarks.datagen --database-url postgresql://localhost/bench --reset --days 90
+
+A SQLite URL works too, without the monthly partitions.
+"""
+import argparse
+import random
+import sys
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, List
+
+from sqlalchemy import MetaData, PrimaryKeyConstraint, UniqueConstraint, create_engine, insert
+from sqlalchemy.orm import Session, sessionmaker
+
+import models
+from db import partitions, rollup
+from db.base import Base
+
+ADMIN_NAME = "bench-admin"
+DEFAULT_PASSWORD = "benchmark"
+CHUNK_SIZE = 5000
+
+# Rough mix of report states in a live system
+STATUS_WEIGHTS = {"approved": 70, "submitted": 15, "pending": 10, "rejected": 5}
+CATEGORIES = ["beverages", "snacks", "dairy", "household", "personal care", "frozen"]
+
+
+def _insert(db: Session, model, rows: List[dict], returning=None) -> list:
+    """Inserts `rows` in chunks and returns the `returning` column of each, in order."""
+    table = model.__table__
+    ids = []
+    for start in range(0, len(rows), CHUNK_SIZE):
+        chunk = rows[start:start + CHUNK_SIZE]
+        if returning is None:
+            db.execute(insert(table), chunk)
+        else:
+            ids.extend(db.scalars(insert(table).returning(table.c[returning], sort_by_parameter_order=True), chunk))
+    return ids
+
+
+def generate(
+    db: Session,
+    partners: int = 10,
+    products: int = 100,
+    merchandisers: int = 50,
+    days: int = 60,
+    items_per_report: int = 6,
+    end_date: date = None,
+    password: str = DEFAULT_PASSWORD,
+    seed: int = 0,
+) -> Dict[str, int]:
+    """
+    Writes a synthetic data set covering the `days` days up to `end_date`
+    (yesterday by default) and returns the number of rows per table. Commits.
+    """
+    rng = random.Random(seed)
+    end_date = end_date or date.today() - timedelta(days=1)
+    now = datetime.now(timezone.utc)
+
+    # Hash once; bcrypt per user would dominate generation time
+    from auth.hashing import hash_password
+    password_hash = hash_password(password)
+
+    partner_ids = _insert(db, models.RetailPartner, [
+        {"name": f"Store {n}", "location": f"District {n % 7}", "created_at": now} for n in range(partners)
+    ], returning="id")
+
+    catalog = []
+    for n in range(products):
+        cost = round(rng.uniform(0.5, 40), 2)
+        catalog.append({
+            "name": f"Product {n}",
+            "category": CATEGORIES[n % len(CATEGORIES)],
+            "unit_cost_price": cost,
+            "unit_price": round(cost * rng.uniform(1.1, 1.6), 2),
+            "created_at": now,
+        })
+    product_ids = _insert(db, models.Product, catalog, returning="id")
+    prices = {pid: row["unit_price"] for pid, row in zip(product_ids, catalog)}
+
+    # Each store carries a random ~60% of the catalog
+    stocked: Dict[int, List[int]] = {}
+    inventory_rows = []
+    for partner_id in partner_ids:
+        stocked[partner_id] = sorted(rng.sample(product_ids, k=max(1, int(len(product_ids) * 0.6))))
+        inventory_rows.extend(
+            {
+                "retail_partner_id": partner_id,
+                "product_id": product_id,
+                "quantity": rng.randint(days * 5, days * 50),
+                "unit_selling_price": prices[product_id],
+                "last_updated": now,
+            } for product_id in stocked[partner_id]
+        )
+    _insert(db, models.Inventory, inventory_rows)
+
+    user_rows = [{
+        "name": ADMIN_NAME, "password_hash": password_hash, "role": "admin", "retail_partner_id": None, "created_at": now,
+    }]
+    user_rows.extend(
+        {
+            "name": f"merch-{n}",
+            "password_hash": password_hash,
+            "role": "merchandiser",
+            "retail_partner_id": partner_ids[n % len(partner_ids)],
+            "created_at": now,
+        } for n in range(merchandisers)
+    )
+    user_ids = _insert(db, models.User, user_rows, returning="id")
+    admin_id, merchandiser_ids = user_ids[0], user_ids[1:]
+
+    statuses, weights = zip(*STATUS_WEIGHTS.items())
+    report_rows = []
+    for offset in range(days):
+        report_date = end_date - timedelta(days=offset)
+        for n, merchandiser_id in enumerate(merchandiser_ids):
+            report_rows.append({
+                "merchandiser_id": merchandiser_id,
+                "retail_partner_id": partner_ids[n % len(partner_ids)],
+                "report_date": report_date,
+                "status": rng.choices(statuses, weights)[0],
+                "submitted_at": datetime.combine(report_date, datetime.min.time(), timezone.utc) + timedelta(hours=18),
+            })
+    report_ids = _insert(db, models.DailySalesReport, report_rows, returning="id")
+
+    item_rows = []
+    item_count = 0
+    audit_rows = []
+    for report_id, report in zip(report_ids, report_rows):
+        shelf = stocked[report["retail_partner_id"]]
+        for product_id in rng.sample(shelf, k=min(items_per_report, len(shelf))):
+            item_rows.append({
+                "report_id": report_id,
+                "report_date": report["report_date"],
+                "product_id": product_id,
+                "quantity_sold": rng.randint(1, 25),
+                "unit_price": prices[product_id],
+                "discount_percent": rng.choice((0, 0, 0, 5, 10, 15)),
+            })
+        if report["status"] in ("approved", "rejected"):
+            audit_rows.append({
+                "user_id": admin_id,
+                "action": f"report_{report['status']}",
+                "table_name": models.DailySalesReport.__tablename__,
+                "row_id": report_id,
+                "message": f"Report {report_id} {report['status']}",
+                "created_at": report["submitted_at"] + timedelta(hours=rng.randint(1, 48)),
+            })
+        if len(item_rows) >= CHUNK_SIZE:
+            _insert(db, models.DailySalesItem, item_rows)
+            item_count += len(item_rows)
+            item_rows.clear()
+    _insert(db, models.DailySalesItem, item_rows)
+    item_count += len(item_rows)
+    _insert(db, models.AuditLog, audit_rows)
+
+    rollup_rows = rollup.rebuild(db)
+    db.commit()
+
+    return {
+        "retail_partners": len(partner_ids),
+        "products": len(product_ids),
+        "inventory": len(inventory_rows),
+        "users": len(user_ids),
+        "daily_sales_report": len(report_ids),
+        "daily_sales_items": item_count,
+        "audit_logs": len(audit_rows),
+        "daily_sales_rollup": rollup_rows,
+    }
+
+
+def _metadata(engine) -> MetaData:
+    """
+    The models' metadata, or on SQLite a copy it can create: SQLite cannot
+    autoincrement a composite primary key, so the partitioned sales tables keep
+    theirs on id alone (ids come from one sequence and are unique by themselves),
+    with (id, report_date) unique for the items' foreign key.
+    """
+    if engine.dialect.name != "sqlite":
+        return Base.metadata
+    metadata = MetaData()
+    for table in Base.metadata.sorted_tables:
+        copy = table.to_metadata(metadata)
+        if table.name in partitions.PARTITIONED_TABLES:
+            copy.c.report_date.primary_key = False
+            copy.append_constraint(PrimaryKeyConstraint(copy.c.id))
+            copy.append_constraint(UniqueConstraint(copy.c.id, copy.c.report_date))
+    return metadata
+
+
+def create_schema(engine) -> None:
+    """Creates the tables of the models missing on `engine`."""
+    _metadata(engine).create_all(engine)
+
+
+def reset_schema(engine) -> None:
+    """Drops and recreates every table of the models on `engine`."""
+    metadata = _metadata(engine)
+    metadata.drop_all(engine)
+    metadata.create_all(engine)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Fill a disposable database with synthetic sales data.")
+    parser.add_argument("--database-url", required=True)
+    parser.add_argument("--reset", action="store_true", help="drop and recreate all tables first")
+    parser.add_argument("--partners", type=int, default=10)
+    parser.add_argument("--products", type=int, default=100)
+    parser.add_argument("--merchandisers", type=int, default=50)
+    parser.add_argument("--days", type=int, default=60)
+    parser.add_argument("--items-per-report", type=int, default=6)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    engine = create_engine(args.database_url)
+    if args.reset:
+        reset_schema(engine)
+    with sessionmaker(bind=engine)() as db:
+        counts = generate(
+            db, partners=args.partners, products=args.products, merchandisers=args.merchandisers,
+            days=args.days, items_per_report=args.items_per_report, seed=args.seed,
+        )
+    for table, count in counts.items():
+        print(f"{table:<22} {count:>10}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
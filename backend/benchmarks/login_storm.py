@@ -0,0 +1,102 @@
+"""
+Login storm benchmark against a running server.
+
+Fires `--logins` concurrent POST /auth/login requests while a probe repeatedly
+GETs a cheap endpoint, then reports login throughput, how many logins were shed
+with 503, and the probe's latency during the storm compared to before it.
+
+    uvicorn main:app --port 8000 --workers 1
+    python -m benchmarks.login_storm --username m0 --password secret
+
+Requires httpx.
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+
+import httpx
+
+
+def _percentiles(latencies: list) -> dict:
+    latencies = sorted(latencies)
+    if not latencies:
+        return {"count": 0}
+    return {
+        "count": len(latencies),
+        "p50_ms": round(statistics.median(latencies) * 1000, 2),
+        "p95_ms": round(latencies[max(int(len(latencies) * 0.95) - 1, 0)] * 1000, 2),
+        "max_ms": round(latencies[-1] * 1000, 2),
+    }
+
+
+async def _probe(client: httpx.AsyncClient, path: str, stop: asyncio.Event, latencies: list):
+    while not stop.is_set():
+        start = time.perf_counter()
+        await client.get(path)
+        latencies.append(time.perf_counter() - start)
+        await asyncio.sleep(0.01)
+
+
+async def run(url: str, username: str, password: str, logins: int, concurrency: int, probe_path: str) -> dict:
+    async with httpx.AsyncClient(base_url=url, timeout=120, limits=httpx.Limits(max_connections=concurrency + 1)) as client:
+        # Baseline probe latency with no login traffic
+        baseline = []
+        stop = asyncio.Event()
+        probe = asyncio.create_task(_probe(client, probe_path, stop, baseline))
+        await asyncio.sleep(2)
+        stop.set()
+        await probe
+
+        during = []
+        stop = asyncio.Event()
+        probe = asyncio.create_task(_probe(client, probe_path, stop, during))
+        statuses = {}
+        remaining = iter(range(logins))
+
+        async def login_worker():
+            for _ in remaining:
+                response = await client.post("/auth/login", data={"username": username, "password": password})
+                statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+        start = time.perf_counter()
+        await asyncio.gather(*(login_worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+        stop.set()
+        await probe
+
+    return {
+        "logins": logins,
+        "concurrency": concurrency,
+        "elapsed_s": round(elapsed, 2),
+        "successful_logins_per_s": round(statuses.get(200, 0) / elapsed, 1),
+        "statuses": statuses,
+        "probe_path": probe_path,
+        "probe_baseline": _percentiles(baseline),
+        "probe_during_storm": _percentiles(during),
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Login storm benchmark against a running server.")
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--username", required=True)
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--logins", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--probe-path", default="/")
+    parser.add_argument("--json", dest="json_path", help="also write results to this file")
+    args = parser.parse_args(argv)
+
+    result = asyncio.run(run(args.url, args.username, args.password, args.logins, args.concurrency, args.probe_path))
+    print(json.dumps(result, indent=2))
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(result, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,139 @@
+"""
+Serialization benchmark for large list responses.
+
+Builds `--items` prevalidated report models (as `get_daily_sales_reports` does)
+and times turning them into a response body:
+
+- in process: `jsonable_encoder` + json.dumps (classic JSONResponse), the same
+  with orjson, validate + pydantic-core dump (FastAPI's `response_model` path
+  on recent versions), and the pydantic-core dump alone (`fast_json`);
+- end to end through a small FastAPI app: a route returning the list with
+  `response_model`, the same with `ORJSONResponse`, and one returning
+  `fast_json.model_list_response`.
+
+Times are milliseconds per `--items` items, median of `--repeat` runs:
+
+    python -m benchmarks.serialization --items 10000 --json serialization.json
+
+Requires httpx; the orjson rows are skipped without orjson.
+"""
+import argparse
+import json
+import statistics
+import sys
+import time
+from datetime import date, datetime, timedelta, timezone
+from typing import List
+
+from fastapi import FastAPI
+from fastapi.encoders import jsonable_encoder
+from fastapi.testclient import TestClient
+from pydantic import TypeAdapter
+
+from api import fast_json
+from api.sales_api import DailySalesItemResponse, DailySalesReportResponse
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _reports(count: int, items_per_report: int) -> List[DailySalesReportResponse]:
+    submitted = datetime(2026, 1, 1, 18, tzinfo=timezone.utc)
+    return [
+        DailySalesReportResponse(
+            salesId=n,
+            data=[
+                DailySalesItemResponse(
+                    productId=p, productName=f"Product {p}", quantitySold=p + 1, salesPrice=9.99, discountPercent=5
+                ) for p in range(items_per_report)
+            ],
+            merchandiserId=n % 50,
+            merchandiserName=f"merch-{n % 50}",
+            retailPartnerId=n % 10,
+            reportDate=date(2026, 1, 1) + timedelta(days=n % 365),
+            status="approved",
+            notes=None,
+            submittedAt=submitted,
+        ) for n in range(count)
+    ]
+
+
+def _median_ms(fn, repeat: int) -> float:
+    fn()  # warm up caches and lazily built serializers
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return round(statistics.median(timings) * 1000, 2)
+
+
+def _app(reports) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/response-model", response_model=List[DailySalesReportResponse])
+    def response_model():
+        return reports
+
+    if orjson is not None:
+        @app.get("/response-model-orjson", response_model=List[DailySalesReportResponse], response_class=fast_json.ORJSONResponse)
+        def response_model_orjson():
+            return reports
+
+    @app.get("/fast", response_model=List[DailySalesReportResponse])
+    def fast():
+        return fast_json.model_list_response(DailySalesReportResponse, reports)
+
+    return app
+
+
+def run(count: int, items_per_report: int, repeat: int) -> dict:
+    reports = _reports(count, items_per_report)
+    adapter = TypeAdapter(List[DailySalesReportResponse])
+
+    in_process = {
+        "jsonable_encoder+json": lambda: json.dumps(jsonable_encoder(reports), ensure_ascii=False).encode(),
+        "validate+dump_json": lambda: adapter.dump_json(adapter.validate_python(reports), by_alias=True),
+        "dump_json (fast path)": lambda: fast_json.dump_model_list(DailySalesReportResponse, reports),
+    }
+    if orjson is not None:
+        in_process["jsonable_encoder+orjson"] = lambda: orjson.dumps(jsonable_encoder(reports))
+
+    results = {"items": count, "items_per_report": items_per_report, "in_process_ms": {}, "endpoint_ms": {}}
+    for name, fn in in_process.items():
+        results["in_process_ms"][name] = _median_ms(fn, repeat)
+
+    client = TestClient(_app(reports))
+    bodies = {}
+    for route in [r.path for r in client.app.routes if r.path.startswith(("/response-model", "/fast"))]:
+        bodies[route] = client.get(route).content
+        results["endpoint_ms"][route] = _median_ms(lambda: client.get(route), repeat)
+    # The fast path must not change what clients receive
+    results["fast_path_identical"] = json.loads(bodies["/fast"]) == json.loads(bodies["/response-model"])
+    return results
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Serialization benchmark for large list responses.")
+    parser.add_argument("--items", type=int, default=10000)
+    parser.add_argument("--items-per-report", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--json", dest="json_path", help="also write results to this file")
+    args = parser.parse_args(argv)
+
+    results = run(args.items, args.items_per_report, args.repeat)
+    print(f"{args.items} reports x {args.items_per_report} items, median of {args.repeat}")
+    for section in ("in_process_ms", "endpoint_ms"):
+        for name, ms in results[section].items():
+            print(f"  {name:<28} {ms:>9} ms")
+    print(f"  fast path output identical: {results['fast_path_identical']}")
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,286 @@
+"""
+In-process benchmark suite for the API.
+
+Times the key endpoints through the ASGI app (no server, no network) against a
+database filled by `benchmarks.datagen`, and writes the timings as JSON so two
+runs can be compared:
+
+    python -m benchmarks.suite --database-url postgresql://localhost/bench --reset --days 90 \\
+        --output before.json
+    # ... change sales_api.py ...
+    python -m benchmarks.suite --database-url postgresql://localhost/bench --output after.json \\
+        --compare before.json
+
+Each case listed in `QUERY_BUDGETS` is also run once under `db.query_metrics.query_budget` with
+its limits; a case that runs more statements, or repeats one
+(an N+1), is reported and makes the run exit with status 1, so loading
+regressions fail even when the timings look fine.
+
+Without `--reset` the data already in the database is reused, and generated if
+the database is empty. `--database-url` defaults to the app's own database from
+`.env`; always point it at a disposable one. A SQLite URL works as a stand-in for
+a quick run, but endpoints that rely on Postgres features will show up as errors.
+
+Requires httpx.
+"""
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, delete, func, select
+from sqlalchemy.orm import sessionmaker
+
+import models
+from benchmarks import datagen
+from db import query_metrics
+from db.base import Base
+from db.database import get_db
+
+# Case name prefix -> (max statements, max executions of one statement shape)
+QUERY_BUDGETS = {
+    "reports.list_summary": (3, 1),  # reports, then item totals in one aggregate
+    "reports.create": (7, 1),        # lock, report, items in one executemany, then the reload
+    "reports.": (4, 1),              # reports, then each eager-loaded relationship once
+    "inventory.": (2, 1),            # ETag marker, then the payload
+}
+
+
+def _query_budget(name: str):
+    return next((budget for prefix, budget in QUERY_BUDGETS.items() if name.startswith(prefix)), None)
+
+
+def _stats(latencies: list, errors: int) -> dict:
+    latencies = sorted(latencies)
+    return {
+        "count": len(latencies),
+        "errors": errors,
+        "min_ms": round(latencies[0] * 1000, 3),
+        "p50_ms": round(statistics.median(latencies) * 1000, 3),
+        "p95_ms": round(latencies[max(int(len(latencies) * 0.95) - 1, 0)] * 1000, 3),
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 3),
+        "max_ms": round(latencies[-1] * 1000, 3),
+    }
+
+
+def _fixtures(Session) -> dict:
+    """Ids and values from the generated data that the cases are parameterised with."""
+    with Session() as db:
+        report = models.DailySalesReport
+        merchandiser = db.execute(
+            select(models.User.id, models.User.name, models.User.retail_partner_id)
+            .where(models.User.role == "merchandiser").order_by(models.User.id).limit(1)
+        ).one()
+        last_date = db.scalar(select(func.max(report.report_date)))
+        return {
+            "partner_id": merchandiser.retail_partner_id,
+            "merchandiser_id": merchandiser.id,
+            "merchandiser_name": merchandiser.name,
+            "report_id": db.scalar(select(func.min(report.id))),
+            "last_date": last_date,
+            "product_ids": list(db.scalars(
+                select(models.Inventory.product_id)
+                .where(models.Inventory.retail_partner_id == merchandiser.retail_partner_id)
+                .order_by(models.Inventory.product_id).limit(5)
+            )),
+        }
+
+
+def _cases(client: TestClient, fx: dict, password: str) -> dict:
+    """Benchmark name -> zero-argument callable returning a response."""
+    reports = "/sales/daily-sales-reports"
+    first_page = client.get(reports, params={"limit": 100})
+    cursor = first_page.json()["nextCursor"]
+    new_dates = iter(fx["last_date"] + timedelta(days=n) for n in range(1, 1_000_000))
+
+    def create_report():
+        return client.post(reports, json={
+            "merchandiserId": fx["merchandiser_id"],
+            "retailPartnerId": fx["partner_id"],
+            "reportDate": next(new_dates).isoformat(),
+            "status": "submitted",
+            "data": [
+                {"productId": pid, "quantitySold": 3, "salesPrice": 9.5, "discountPercent": 5}
+                for pid in fx["product_ids"]
+            ],
+        })
+
+    return {
+        "reports.list": lambda: client.get(reports, params={"limit": 100}),
+        "reports.list_summary": lambda: client.get(reports, params={"limit": 100, "view": "summary"}),
+        "reports.next_page": lambda: client.get(reports, params={"limit": 100, "cursor": cursor}),
+        "reports.by_status": lambda: client.get(reports, params={"status": "pending", "limit": 100}),
+        "reports.by_partner": lambda: client.get(reports, params={"retail_partner_id": fx["partner_id"], "limit": 100}),
+        "reports.by_merchandiser": lambda: client.get(reports, params={"merchandiser_id": fx["merchandiser_id"], "limit": 100}),
+        "reports.by_date": lambda: client.get(reports, params={"report_date": fx["last_date"].isoformat()}),
+        "reports.by_id": lambda: client.get(reports, params={"saleid": fx["report_id"]}),
+        "inventory.summary": lambda: client.get("/sales/inventory/summary"),
+        "inventory.details_by_store": lambda: client.get("/sales/inventory/details-by-store"),
+        "inventory.store": lambda: client.get(f"/sales/inventory/{fx['partner_id']}"),
+        "reports.create": create_report,
+        "auth.login": lambda: client.post(
+            "/auth/login", data={"username": fx["merchandiser_name"], "password": password}
+        ),
+    }
+
+
+def run(Session, repeat: int, warmup: int, only=None, password: str = datagen.DEFAULT_PASSWORD) -> dict:
+    """Runs every case `warmup + repeat` times and returns the timing stats per case."""
+    import main  # Imported late so the app's engine is only created once the environment is set up
+
+    def _get_db():
+        db = Session()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    main.app.dependency_overrides[get_db] = _get_db
+    fx = _fixtures(Session)
+    created = []
+    results = {}
+    try:
+        with TestClient(main.app, raise_server_exceptions=False) as client:
+            for name, call in _cases(client, fx, password).items():
+                if only and not any(name.startswith(prefix) for prefix in only):
+                    continue
+                latencies, errors = [], 0
+                over_budget = None
+                budget = _query_budget(name)
+                if budget:
+                    try:
+                        with query_metrics.query_budget(*budget):
+                            response = call()
+                    except query_metrics.QueryBudgetExceeded as e:
+                        over_budget = str(e)
+                        print(f"{name:<28} {over_budget}")
+                    if name == "reports.create" and response.status_code == 201:
+                        created.append(response.json()["salesId"])
+                for n in range(warmup + repeat):
+                    start = time.perf_counter()
+                    response = call()
+                    elapsed = time.perf_counter() - start
+                    if name == "reports.create" and response.status_code == 201:
+                        created.append(response.json()["salesId"])
+                    if n < warmup:
+                        continue
+                    latencies.append(elapsed)
+                    errors += response.status_code >= 400
+                results[name] = _stats(latencies, errors)
+                if over_budget:
+                    results[name]["over_budget"] = over_budget
+                print(f"{name:<28} p50 {results[name]['p50_ms']:>9} ms  p95 {results[name]['p95_ms']:>9} ms  errors {errors}")
+    finally:
+        main.app.dependency_overrides.pop(get_db, None)
+        # Leave the data set as generated so later runs are comparable
+        if created:
+            with Session() as db:
+                db.execute(delete(models.DailySalesItem).where(models.DailySalesItem.report_id.in_(created)))
+                db.execute(delete(models.DailySalesReport).where(models.DailySalesReport.id.in_(created)))
+                db.commit()
+    return results
+
+
+def compare(baseline: dict, current: dict, threshold: float) -> list:
+    """Prints p50 changes against `baseline` and returns the names that regressed by more than `threshold`."""
+    regressed = []
+    for name, stats in current["results"].items():
+        before = baseline["results"].get(name)
+        if not before:
+            continue
+        change = stats["p50_ms"] / before["p50_ms"] - 1 if before["p50_ms"] else 0.0
+        flag = ""
+        if change > threshold:
+            flag = "  REGRESSION"
+            regressed.append(name)
+        print(f"{name:<28} {before['p50_ms']:>9} -> {stats['p50_ms']:>9} ms  {change:+7.1%}{flag}")
+    return regressed
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="In-process benchmark suite for the API.")
+    parser.add_argument("--database-url", help="database to benchmark against (default: the app's database)")
+    parser.add_argument("--reset", action="store_true", help="drop, recreate and regenerate all tables first")
+    parser.add_argument("--partners", type=int, default=10)
+    parser.add_argument("--products", type=int, default=100)
+    parser.add_argument("--merchandisers", type=int, default=50)
+    parser.add_argument("--days", type=int, default=60)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=30, help="timed calls per case")
+    parser.add_argument("--warmup", type=int, default=3, help="untimed calls per case")
+    parser.add_argument("--only", action="append", help="only run cases whose name starts with this (repeatable)")
+    parser.add_argument("--output", help="write results to this JSON file")
+    parser.add_argument("--compare", help="JSON results of an earlier run to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="p50 slowdown that counts as a regression")
+    args = parser.parse_args(argv)
+
+    if args.database_url:
+        engine = create_engine(args.database_url)
+    else:
+        from db.session import engine
+    Session = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+
+    scale = {
+        "partners": args.partners, "products": args.products,
+        "merchandisers": args.merchandisers, "days": args.days, "seed": args.seed,
+    }
+    if args.reset:
+        datagen.reset_schema(engine)
+    else:
+        datagen.create_schema(engine)
+    with Session() as db:
+        if db.scalar(select(func.count()).select_from(models.DailySalesReport)) == 0:
+            print("Generating data:", ", ".join(f"{k}={v}" for k, v in scale.items()))
+            datagen.generate(db, **scale)
+        # Record what was actually benchmarked; reused data may differ from the scale arguments
+        rows = {
+            table.name: db.scalar(select(func.count()).select_from(table))
+            for table in Base.metadata.sorted_tables
+        }
+
+    results = run(Session, args.repeat, args.warmup, args.only)
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "commit": _git_commit(),
+            "database": engine.dialect.name,
+            "python": platform.python_version(),
+            "rows": rows,
+            "repeat": args.repeat,
+            "warmup": args.warmup,
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    over_budget = [name for name, stats in results.items() if "over_budget" in stats]
+    if over_budget:
+        print(f"\nOver their query budget: {', '.join(over_budget)}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        print(f"\nCompared with {args.compare} ({baseline['meta'].get('commit')}):")
+        if compare(baseline, report, args.threshold):
+            return 1
+    return 1 if over_budget else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
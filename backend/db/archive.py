@@ -0,0 +1,376 @@
+"""
+Cold storage of old sales in Parquet files.
+
+`archive_month` moves one month of `daily_sales_report` and `daily_sales_items`
+out of Postgres into `<SALES_ARCHIVE_DIR>/<YYYY-MM>/`, one zstd-compressed
+Parquet file per table with the table's columns, and drops the month's
+partitions, so the hot tables only hold recent months. `scripts.archive_sales`
+archives every month that ended more than SALES_ARCHIVE_AFTER_DAYS days ago.
+
+Only months whose reports have all been reviewed are archived. Archived months
+are read-only: new reports for them are refused and their reports no longer
+change status. Writers call `lock_months` before checking `is_archived`, which
+orders them against a concurrent `archive_month`. Readers call `read_reports`, `read_items`,
+`lines` and `totals`, which only open the months a date range reaches and
+return nothing without touching the disk otherwise. daily_sales_rollup keeps
+the totals of archived months, so rollup-backed analytics never read the files.
+
+Requires pyarrow, which is only imported once a month has been archived.
+"""
+import os
+import re
+import shutil
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+from dotenv import load_dotenv
+from sqlalchemy import exists, select, text
+from sqlalchemy.orm import Session
+
+import models
+from db import partitions
+
+load_dotenv()
+
+ARCHIVE_DIR = os.getenv("SALES_ARCHIVE_DIR", "archive")
+ARCHIVE_AFTER_DAYS = int(os.getenv("SALES_ARCHIVE_AFTER_DAYS", "90"))
+ARCHIVE_COMPRESSION = "zstd"
+ARCHIVE_BATCH_SIZE = 10000
+
+REPORTS_FILE = "daily_sales_report.parquet"
+ITEMS_FILE = "daily_sales_items.parquet"
+
+# Statuses a report no longer leaves in practice; months with any other are not archived
+REVIEWED_STATUSES = ('approved', 'rejected')
+
+# Postgres advisory lock keys (LOCK_SPACE, year * 12 + month - 1), one per month
+LOCK_SPACE = 25
+
+_MONTH_DIR = re.compile(r"(\d{4})-(\d{2})")
+
+
+def _schemas():
+    import pyarrow as pa  # optional dependency
+    reports = pa.schema([
+        ("id", pa.int32()),
+        ("merchandiser_id", pa.int32()),
+        ("retail_partner_id", pa.int32()),
+        ("report_date", pa.date32()),
+        ("status", pa.string()),
+        ("notes", pa.string()),
+        ("submitted_at", pa.timestamp("us", tz="UTC")),
+    ])
+    items = pa.schema([
+        ("id", pa.int32()),
+        ("report_id", pa.int32()),
+        ("report_date", pa.date32()),
+        ("product_id", pa.int32()),
+        ("quantity_sold", pa.int32()),
+        ("unit_price", pa.decimal128(10, 2)),
+        ("discount_percent", pa.decimal128(5, 2)),
+    ])
+    return reports, items
+
+
+def month_dir(month: date) -> str:
+    return os.path.join(ARCHIVE_DIR, f"{month:%Y-%m}")
+
+
+def archived_months() -> List[date]:
+    """First days of the archived months, oldest first."""
+    try:
+        names = os.listdir(ARCHIVE_DIR)
+    except FileNotFoundError:
+        return []
+    months = []
+    for name in names:
+        match = _MONTH_DIR.fullmatch(name)
+        if match:
+            months.append(date(int(match.group(1)), int(match.group(2)), 1))
+    return sorted(months)
+
+
+def months_between(start_date: Optional[date], end_date: Optional[date]) -> List[date]:
+    """Archived months overlapping the inclusive range; None leaves that side open."""
+    return [
+        month for month in archived_months()
+        if (start_date is None or partitions.add_months(month, 1) > start_date)
+        and (end_date is None or month <= end_date)
+    ]
+
+
+def is_archived(day: date) -> bool:
+    return partitions.month_start(day) in archived_months()
+
+
+def _lock_key(month: date) -> dict:
+    return {"space": LOCK_SPACE, "key": month.year * 12 + month.month - 1}
+
+
+def lock_statements(days: Iterable[date]) -> list:
+    """The statements behind `lock_months` (Postgres only), for callers that execute them themselves."""
+    return [
+        text("SELECT pg_advisory_xact_lock_shared(:space, :key)").bindparams(**_lock_key(month))
+        for month in sorted({partitions.month_start(day) for day in days})
+    ]
+
+
+def lock_months(db: Session, days: Iterable[date]) -> None:
+    """
+    Takes a shared lock on the months of `days` until the end of the
+    transaction, so they are not archived while the caller writes to them.
+    Call before `is_archived`: an archiving in progress finishes first, and the
+    month is then reported as archived. Only Postgres can archive.
+    """
+    if db.get_bind().dialect.name != "postgresql":
+        return
+    for stmt in lock_statements(days):
+        db.execute(stmt)
+
+
+def _has_reports(db: Session, month: date) -> bool:
+    report = models.DailySalesReport
+    return db.scalar(select(exists().where(
+        report.report_date >= month, report.report_date < partitions.add_months(month, 1)
+    )))
+
+
+def _unpublished_months(db: Session) -> List[date]:
+    """Months whose archiving committed but whose files were never moved into place."""
+    try:
+        names = os.listdir(ARCHIVE_DIR)
+    except FileNotFoundError:
+        return []
+    months = []
+    for name in names:
+        match = _MONTH_DIR.fullmatch(name.removesuffix(".partial"))
+        if name.endswith(".partial") and match:
+            month = date(int(match.group(1)), int(match.group(2)), 1)
+            if not _has_reports(db, month):
+                months.append(month)
+    return months
+
+
+def closed_months(db: Session, today: Optional[date] = None) -> List[date]:
+    """
+    Months with reports in Postgres that ended more than ARCHIVE_AFTER_DAYS days
+    ago and whose reports all have a REVIEWED_STATUSES status, plus unfinished
+    archivings to complete.
+    """
+    cutoff = partitions.month_start((today or date.today()) - timedelta(days=ARCHIVE_AFTER_DAYS))
+    months = set(db.scalars(text("""
+        SELECT date_trunc('month', report_date)::date FROM daily_sales_report
+        WHERE report_date < :cutoff
+        GROUP BY 1
+        HAVING bool_and(coalesce(status = ANY(:reviewed), false))
+    """), {"cutoff": cutoff, "reviewed": list(REVIEWED_STATUSES)}))
+    return sorted(months.union(_unpublished_months(db)))
+
+
+def _write(db: Session, stmt, path: str, schema) -> int:
+    import pyarrow as pa  # optional dependency
+    import pyarrow.parquet as pq
+
+    written = 0
+    with pq.ParquetWriter(path, schema, compression=ARCHIVE_COMPRESSION) as writer:
+        result = db.execute(stmt.execution_options(stream_results=True, yield_per=ARCHIVE_BATCH_SIZE))
+        for rows in result.partitions():
+            writer.write_table(pa.Table.from_pylist([row._asdict() for row in rows], schema=schema))
+            written += len(rows)
+    return written
+
+
+def _row_count(path: str) -> int:
+    import pyarrow.parquet as pq  # optional dependency
+    return pq.ParquetFile(path).metadata.num_rows
+
+
+def archive_month(db: Session, month: date) -> Tuple[int, int]:
+    """
+    Writes the reports and items of `month` to Parquet, drops them from
+    Postgres and returns how many of each were archived. Commits. Raises
+    ValueError if the month is already archived or has unreviewed reports.
+    """
+    month = partitions.month_start(month)
+    # Held across the commit until the files are published, on a connection of its
+    # own, so writers waiting in lock_months then find the month archived
+    with db.get_bind().connect() as lock:
+        lock.execute(text("SELECT pg_advisory_lock(:space, :key)"), _lock_key(month))
+        try:
+            return _archive_month(db, month)
+        finally:
+            lock.execute(text("SELECT pg_advisory_unlock(:space, :key)"), _lock_key(month))
+
+
+def _archive_month(db: Session, month: date) -> Tuple[int, int]:
+    if month in archived_months():
+        raise ValueError(f"{month:%Y-%m} is already archived.")
+    staging, target = month_dir(month) + ".partial", month_dir(month)
+    if os.path.isdir(staging) and not _has_reports(db, month):
+        # An earlier run committed but stopped before publishing; its files are the only copy
+        db.rollback()
+        os.rename(staging, target)
+        return _row_count(os.path.join(target, REPORTS_FILE)), _row_count(os.path.join(target, ITEMS_FILE))
+
+    report_schema, item_schema = _schemas()
+    report, item = models.DailySalesReport.__table__, models.DailySalesItem.__table__
+    next_month = partitions.add_months(month, 1)
+
+    # Give the month partitions of its own (moving it out of the default ones) so it can be
+    # dropped whole; committed on its own so the exclusive table locks are not held meanwhile
+    partitions.create_month(db, month)
+    db.commit()
+
+    # Keep the reports from changing status while they are copied; updates find them gone afterwards
+    statuses = set(db.scalars(select(report.c.status).where(
+        report.c.report_date >= month, report.c.report_date < next_month
+    ).with_for_update()))
+    if not statuses <= set(REVIEWED_STATUSES):
+        db.rollback()
+        raise ValueError(f"{month:%Y-%m} still has reports awaiting review.")
+
+    shutil.rmtree(staging, ignore_errors=True)
+    os.makedirs(staging)
+    try:
+        reports = _write(db, select(*[report.c[name] for name in report_schema.names]).where(
+            report.c.report_date >= month, report.c.report_date < next_month
+        ).order_by(report.c.id), os.path.join(staging, REPORTS_FILE), report_schema)
+        items = _write(db, select(*[item.c[name] for name in item_schema.names]).where(
+            item.c.report_date >= month, item.c.report_date < next_month
+        ).order_by(item.c.id), os.path.join(staging, ITEMS_FILE), item_schema)
+
+        # Items first for the foreign key; a partition can only be dropped once nothing references it
+        items_partition = partitions.partition_name(item.name, month)
+        reports_partition = partitions.partition_name(report.name, month)
+        db.execute(text(f"DROP TABLE {items_partition}"))
+        db.execute(text(f"ALTER TABLE {report.name} DETACH PARTITION {reports_partition}"))
+        db.execute(text(f"DROP TABLE {reports_partition}"))
+    except BaseException:
+        db.rollback()
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+    # Publish only once the rows are gone from Postgres, so no reader counts the month twice. If
+    # the commit fails the files stay staged: the next run redoes or publishes them as needed
+    db.commit()
+    os.rename(staging, target)
+    return reports, items
+
+
+def _read(months: Sequence[date], name: str, filters: list):
+    import pyarrow as pa  # optional dependency
+    import pyarrow.parquet as pq
+
+    return pa.concat_tables([
+        pq.read_table(os.path.join(month_dir(month), name), filters=filters or None) for month in months
+    ])
+
+
+def _date_filters(start_date: Optional[date], end_date: Optional[date]) -> list:
+    filters = []
+    if start_date is not None:
+        filters.append(("report_date", ">=", start_date))
+    if end_date is not None:
+        filters.append(("report_date", "<=", end_date))
+    return filters
+
+
+def read_reports(
+    start_date: Optional[date],
+    end_date: Optional[date],
+    report_id: Optional[int] = None,
+    merchandiser_id: Optional[int] = None,
+    retail_partner_id: Optional[int] = None,
+    statuses: Optional[Sequence[str]] = None,
+):
+    """
+    Archived reports in the inclusive date range matching the filters, as a
+    pyarrow Table; None when the range reaches no archived month.
+    """
+    months = months_between(start_date, end_date)
+    if not months:
+        return None
+    filters = _date_filters(start_date, end_date)
+    for column, value in (("id", report_id), ("merchandiser_id", merchandiser_id), ("retail_partner_id", retail_partner_id)):
+        if value is not None:
+            filters.append((column, "=", value))
+    if statuses is not None:
+        filters.append(("status", "in", list(statuses)))
+    return _read(months, REPORTS_FILE, filters)
+
+
+def read_items(
+    start_date: Optional[date],
+    end_date: Optional[date],
+    report_ids: Optional[Sequence[int]] = None,
+    product_ids: Optional[Sequence[int]] = None,
+):
+    """Archived items in the inclusive date range matching the filters, as `read_reports`."""
+    months = months_between(start_date, end_date)
+    if not months:
+        return None
+    filters = _date_filters(start_date, end_date)
+    if report_ids is not None:
+        filters.append(("report_id", "in", list(report_ids)))
+    if product_ids is not None:
+        filters.append(("product_id", "in", list(product_ids)))
+    return _read(months, ITEMS_FILE, filters)
+
+
+def lines(
+    start_date: Optional[date],
+    end_date: Optional[date],
+    merchandiser_id: Optional[int] = None,
+    retail_partner_id: Optional[int] = None,
+    statuses: Optional[Sequence[str]] = None,
+    product_ids: Optional[Sequence[int]] = None,
+):
+    """
+    Archived items in the range joined to their report's merchandiser_id,
+    retail_partner_id and status, with each line's gross_value and net_value
+    (as `rollup.line_values`), ordered by report_date, report_id and id.
+    """
+    import pyarrow as pa  # optional dependency
+    import pyarrow.compute as pc
+
+    reports = read_reports(start_date, end_date, merchandiser_id=merchandiser_id,
+                           retail_partner_id=retail_partner_id, statuses=statuses)
+    if reports is None:
+        return None
+    items = read_items(start_date, end_date, product_ids=product_ids)
+    table = items.join(
+        reports.select(["id", "merchandiser_id", "retail_partner_id", "status"]),
+        keys="report_id", right_keys="id", join_type="inner",
+    )
+    gross = pc.multiply(pc.cast(table["quantity_sold"], pa.decimal128(10, 0)), table["unit_price"])
+    discounted = pc.subtract(pa.scalar(Decimal(100), pa.decimal128(5, 2)), pc.fill_null(table["discount_percent"], Decimal(0)))
+    net = pc.round(
+        pc.divide(pc.multiply(gross, discounted), pa.scalar(Decimal(100), pa.decimal128(3, 0))),
+        2, round_mode="half_towards_infinity",  # numeric round() in Postgres
+    )
+    table = table.append_column("gross_value", gross).append_column("net_value", net)
+    return table.sort_by([("report_date", "ascending"), ("report_id", "ascending"), ("id", "ascending")])
+
+
+def totals(
+    start_date: Optional[date],
+    end_date: Optional[date],
+    keys: Sequence[str],
+    **filters,
+) -> List[dict]:
+    """
+    Quantity, gross and net value of the archived `lines` in the range grouped
+    by `keys` (columns of `lines`), one dict per group. Empty when the range
+    reaches no archived month.
+    """
+    table = lines(start_date, end_date, **filters)
+    if table is None or table.num_rows == 0:
+        return []
+    grouped = table.group_by(list(keys)).aggregate([
+        ("quantity_sold", "sum"), ("gross_value", "sum"), ("net_value", "sum"),
+    ])
+    return grouped.rename_columns(
+        [{"quantity_sold_sum": "quantity", "gross_value_sum": "gross_value", "net_value_sum": "net_value"}.get(name, name)
+         for name in grouped.column_names]
+    ).to_pylist()
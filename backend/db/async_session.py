@@ -0,0 +1,11 @@
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from db.pool_metrics import TimedAsyncAdaptedQueuePool, instrument
+from db.session import DATABASE_URL, POOL_OPTIONS
+
+# Same database as the sync engine, reached through asyncpg (only imported when DB_ASYNC is on)
+ASYNC_DATABASE_URL = DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://", 1)
+
+async_engine = create_async_engine(ASYNC_DATABASE_URL, poolclass=TimedAsyncAdaptedQueuePool, **POOL_OPTIONS)
+instrument("async", async_engine)
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
@@ -6,4 +6,9 @@ def get_db():
         yield db
     finally:
         db.close()
-    
\ No newline at end of file
+
+async def get_async_db():
+    # Imported here so asyncpg is only required when the async stack is enabled
+    from db.async_session import AsyncSessionLocal
+    async with AsyncSessionLocal() as db:
+        yield db
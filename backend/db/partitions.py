@@ -0,0 +1,120 @@
+"""
+Monthly range partitions of the sales tables.
+
+`daily_sales_report` and `daily_sales_items` are partitioned by RANGE
+(report_date), one partition per calendar month named `<table>_yYYYYmMM`, with
+a `<table>_default` partition catching dates no monthly partition covers yet.
+Items carry their report's date, so both tables split along the same bounds
+and queries filtered on report_date only scan the matching months.
+
+`ensure_partitions` creates the partitions of the current month and the next
+`PARTITIONS_AHEAD` months, and splits out of the default partitions any month
+that was written before its partition existed, except archived months
+(see db/archive.py), which stay out of Postgres. Run it regularly (e.g. daily
+from cron via `scripts.create_partitions`); it is idempotent.
+"""
+import os
+from datetime import date
+from typing import Iterable, List, Optional
+
+from dotenv import load_dotenv
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+load_dotenv()
+
+# Parent before child: rows move and partitions attach in this order so the
+# items -> report foreign key always holds
+PARTITIONED_TABLES = ("daily_sales_report", "daily_sales_items")
+PARTITIONS_AHEAD = int(os.getenv("PARTITIONS_AHEAD", "3"))
+
+
+def month_start(day: date) -> date:
+    return day.replace(day=1)
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table: str, month: date) -> str:
+    return f"{table}_y{month:%Y}m{month:%m}"
+
+
+def existing(db: Session) -> set:
+    """Names of the attached partitions of the sales tables."""
+    return set(db.scalars(text("""
+        SELECT child.relname
+        FROM pg_inherits
+        JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+        JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+        WHERE parent.relname = ANY(:tables)
+    """), {"tables": list(PARTITIONED_TABLES)}))
+
+
+def months_in_default(db: Session) -> List[date]:
+    """Months with reports in the default partition, i.e. without a partition of their own."""
+    return list(db.scalars(text(
+        "SELECT DISTINCT date_trunc('month', report_date)::date FROM daily_sales_report_default ORDER BY 1"
+    )))
+
+
+def create_month(db: Session, month: date) -> bool:
+    """
+    Creates the partitions of `month` for both tables unless they exist and
+    returns whether it did. Rows for the month already in the default
+    partitions are moved into the new ones. Does not commit.
+    """
+    month = month_start(month)
+    if partition_name(PARTITIONED_TABLES[0], month) in existing(db):
+        return False
+    bounds = f"FOR VALUES FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')"
+
+    # Adding a partition scans the default one and fails if it holds rows for the new
+    # range, so no rows may arrive meanwhile. Take the lock the DDL below needs up
+    # front, in the order writers lock (report then items, each parent before its
+    # partitions), so a concurrent insert waits instead of deadlocking
+    db.execute(text(f"LOCK TABLE {', '.join(PARTITIONED_TABLES)} IN ACCESS EXCLUSIVE MODE"))
+    if partition_name(PARTITIONED_TABLES[0], month) in existing(db):
+        return False
+    has_rows = db.scalar(text(
+        "SELECT EXISTS (SELECT 1 FROM daily_sales_report_default WHERE report_date >= :start AND report_date < :end)"
+    ), {"start": month, "end": add_months(month, 1)})
+
+    if not has_rows:
+        for table in PARTITIONED_TABLES:
+            db.execute(text(f"CREATE TABLE {partition_name(table, month)} PARTITION OF {table} {bounds}"))
+        return True
+
+    # Move the rows into standalone tables, children first so the foreign key
+    # holds while deleting, then attach parents first so it holds while attaching
+    for table in reversed(PARTITIONED_TABLES):
+        name = partition_name(table, month)
+        db.execute(text(f"CREATE TABLE {name} (LIKE {table} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"))
+        db.execute(text(f"""
+            WITH moved AS (
+                DELETE FROM {table}_default WHERE report_date >= :start AND report_date < :end RETURNING *
+            )
+            INSERT INTO {name} SELECT * FROM moved
+        """), {"start": month, "end": add_months(month, 1)})
+    for table in PARTITIONED_TABLES:
+        db.execute(text(f"ALTER TABLE {table} ATTACH PARTITION {partition_name(table, month)} {bounds}"))
+    return True
+
+
+def ensure_partitions(db: Session, months_ahead: int = PARTITIONS_AHEAD, start: Optional[date] = None) -> List[date]:
+    """
+    Creates the partitions from `start`'s month (default: this month) through
+    `months_ahead` months later, plus those of months found in the default
+    partitions, and returns the months created. Archived months are skipped.
+    Does not commit.
+    """
+    from db import archive  # imports this module
+
+    first = month_start(start or date.today())
+    months: Iterable[date] = sorted(
+        {*months_in_default(db), *(add_months(first, n) for n in range(months_ahead + 1))}
+        - set(archive.archived_months())
+    )
+    return [month for month in months if create_month(db, month)]
@@ -0,0 +1,113 @@
+"""
+Connection pool instrumentation.
+
+`TimedQueuePool` / `TimedAsyncAdaptedQueuePool` time how long each checkout waits
+for a free connection, and pool events track checkouts and checkins. The counters
+belong to the engine and are handed on to the pool that replaces the current one
+on `engine.dispose()`. `pool_stats` returns a snapshot for the internal stats
+endpoint.
+"""
+import threading
+import time
+
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+
+class PoolStats:
+    """Thread-safe counters for one pool."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.checkins = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.waits_over_100ms = 0
+
+    def record_wait(self, seconds: float, timed_out: bool = False):
+        with self._lock:
+            self.wait_total += seconds
+            self.wait_max = max(self.wait_max, seconds)
+            if seconds > 0.1:
+                self.waits_over_100ms += 1
+            if timed_out:
+                self.timeouts += 1
+
+    def record_checkout(self):
+        with self._lock:
+            self.checkouts += 1
+
+    def record_checkin(self):
+        with self._lock:
+            self.checkins += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "timeouts": self.timeouts,
+                "wait_total_ms": round(self.wait_total * 1000, 3),
+                "wait_avg_ms": round(self.wait_total * 1000 / self.checkouts, 3) if self.checkouts else 0.0,
+                "wait_max_ms": round(self.wait_max * 1000, 3),
+                "waits_over_100ms": self.waits_over_100ms,
+            }
+
+
+class _TimedGetMixin:
+    """Times the wait for a connection inside the pool's checkout."""
+    stats: PoolStats
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except PoolTimeoutError:
+            self.stats.record_wait(time.perf_counter() - start, timed_out=True)
+            raise
+        self.stats.record_wait(time.perf_counter() - start)
+        return conn
+
+    def recreate(self):
+        # Event listeners are carried over by the base class, the stats are not
+        pool = super().recreate()
+        pool.stats = self.stats
+        return pool
+
+
+class TimedQueuePool(_TimedGetMixin, QueuePool):
+    pass
+
+
+class TimedAsyncAdaptedQueuePool(_TimedGetMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+_instrumented = {}
+
+
+def instrument(name: str, engine) -> None:
+    """Attaches stats to an engine created with one of the timed pool classes."""
+    stats = PoolStats()
+    engine.pool.stats = stats
+    event.listen(engine.pool, "checkout", lambda *args: stats.record_checkout())
+    event.listen(engine.pool, "checkin", lambda *args: stats.record_checkin())
+    _instrumented[name] = (engine, stats)
+
+
+def pool_stats() -> dict:
+    """Current pool state and counters for every instrumented engine."""
+    result = {}
+    for name, (engine, stats) in _instrumented.items():
+        pool = engine.pool
+        result[name] = {
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            "overflow": max(pool.overflow(), 0),  # negative while the pool isn't full
+            **stats.snapshot(),
+        }
+    return result
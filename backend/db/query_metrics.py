@@ -0,0 +1,132 @@
+"""
+Per-request database time and query counts.
+
+`start` opens a `RequestQueryStats` for the current context and cursor events on
+every Engine add each statement's duration to it. Sync route handlers run in a
+copy of the request's context and `AsyncSession.run_sync` keeps it, so the stats
+opened by the metrics middleware see the queries of both database stacks.
+Statements executed outside a request are not tracked.
+
+With QUERY_DEBUG on, each request also counts executions per statement shape
+(the SQL text before parameters are bound), so a statement repeated once per
+row of a parent query - an N+1 - can be reported. `query_budget` applies the
+same counting to a block of test code and fails when a budget is exceeded.
+"""
+import os
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from typing import List, Optional, Tuple
+
+from dotenv import load_dotenv
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+load_dotenv()
+
+QUERY_DEBUG = os.getenv("QUERY_DEBUG", "false").lower() in ("1", "true", "yes")
+# A statement shape executed this many times in one request is flagged as N+1
+QUERY_REPEAT_THRESHOLD = int(os.getenv("QUERY_REPEAT_THRESHOLD", "5"))
+
+
+class RequestQueryStats:
+    """Query count and total database time of one request."""
+    __slots__ = ("queries", "db_time", "shapes")
+
+    def __init__(self, track_shapes: bool = False):
+        self.queries = 0
+        self.db_time = 0.0
+        self.shapes: Optional[Counter] = Counter() if track_shapes else None
+
+    def record(self, statement: str, seconds: float) -> None:
+        self.queries += 1
+        self.db_time += seconds
+        if self.shapes is not None:
+            self.shapes[statement] += 1
+
+    def repeated(self, threshold: int = QUERY_REPEAT_THRESHOLD) -> List[Tuple[str, int]]:
+        """Statement shapes executed at least `threshold` times, most repeated first."""
+        if not self.shapes:
+            return []
+        return [(shape, count) for shape, count in self.shapes.most_common() if count >= threshold]
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+_current: ContextVar[Optional[RequestQueryStats]] = ContextVar("request_query_stats", default=None)
+_budgets: List[RequestQueryStats] = []
+_budgets_lock = threading.Lock()
+
+
+def start() -> Tuple[RequestQueryStats, Token]:
+    """Starts tracking for the current context; pass the token to `stop`."""
+    stats = RequestQueryStats(track_shapes=QUERY_DEBUG)
+    return stats, _current.set(stats)
+
+
+def stop(token: Token) -> None:
+    _current.reset(token)
+
+
+def current() -> Optional[RequestQueryStats]:
+    """The stats of the request being handled, if any."""
+    return _current.get()
+
+
+def _summarise(stats: RequestQueryStats, threshold: int) -> str:
+    lines = [f"{stats.queries} statements, {stats.db_time * 1000:.1f} ms"]
+    lines += [f"  {count}x {shape[:200]}" for shape, count in stats.repeated(threshold)]
+    return "\n".join(lines)
+
+
+@contextmanager
+def query_budget(max_queries: int, max_repeats: Optional[int] = None):
+    """
+    Counts every statement executed on any engine, in any thread, inside the
+    block - including the requests a TestClient serves - and raises
+    `QueryBudgetExceeded` when the block finishes if more than `max_queries`
+    ran, or if any one statement shape ran more than `max_repeats` times:
+
+        with query_budget(4, max_repeats=1):
+            client.get("/sales/daily-sales-reports")
+    """
+    budget = RequestQueryStats(track_shapes=True)
+    with _budgets_lock:
+        _budgets.append(budget)
+    try:
+        yield budget
+    finally:
+        with _budgets_lock:
+            _budgets.remove(budget)
+
+    if budget.queries > max_queries:
+        raise QueryBudgetExceeded(f"Query budget of {max_queries} exceeded: {_summarise(budget, 2)}")
+    if max_repeats is not None and budget.repeated(max_repeats + 1):
+        raise QueryBudgetExceeded(
+            f"Statement repeated more than {max_repeats} times: {_summarise(budget, max_repeats + 1)}"
+        )
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None or _budgets:
+        context._query_started = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, "_query_started", None)
+    if started is None:
+        return
+    elapsed = time.perf_counter() - started
+    stats = _current.get()
+    if stats is not None:
+        stats.record(statement, elapsed)
+    if _budgets:
+        with _budgets_lock:
+            for budget in _budgets:
+                budget.record(statement, elapsed)
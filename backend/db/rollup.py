@@ -0,0 +1,140 @@
+"""
+Maintenance of the `daily_sales_rollup` table.
+
+The rollup holds per (report_date, retail_partner_id, product_id) totals of the
+items of every report whose status is in `ROLLUP_STATUSES`. Writers call
+`apply_reports` inside their own transaction whenever a report starts or stops
+counting; `rebuild` recomputes a date range from the raw items for backfills.
+Keys whose totals are all zero, e.g. once their only report is un-approved,
+have no row, so the table always equals what `rebuild` would write.
+"""
+from datetime import date, timedelta
+from typing import Iterable, List, Optional
+
+from sqlalchemy import delete, func, insert, literal, select, text, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+import models
+from db import archive, partitions
+
+ROLLUP_STATUSES = ('approved',)
+
+
+def counts(status: Optional[str]) -> bool:
+    """Whether a report with this status contributes to the rollup."""
+    return status in ROLLUP_STATUSES
+
+
+def line_values():
+    """Gross and net (after discount, rounded per line) value expressions of one sales item."""
+    item = models.DailySalesItem
+    gross = item.quantity_sold * item.unit_price
+    net = func.round(gross * (100 - func.coalesce(item.discount_percent, 0)) / 100, 2)
+    return gross, net
+
+
+def _aggregate(sign: int = 1):
+    """Grouped item totals per rollup key, multiplied by `sign`."""
+    report = models.DailySalesReport
+    item = models.DailySalesItem
+    gross, net = line_values()
+    return select(
+        report.report_date,
+        report.retail_partner_id,
+        item.product_id,
+        func.sum(item.quantity_sold) * literal(sign),
+        func.sum(gross) * literal(sign),
+        func.sum(net) * literal(sign),
+    ).join(item, (item.report_id == report.id) & (item.report_date == report.report_date)).group_by(
+        report.report_date, report.retail_partner_id, item.product_id
+    )
+
+
+def apply_statements(report_ids: List[int], sign: int = 1) -> list:
+    """
+    The statements behind `apply_reports`, in order, for callers that execute
+    them themselves: the upsert, then a delete of the keys it brought to zero.
+    """
+    rollup = models.DailySalesRollup.__table__
+    report = models.DailySalesReport
+    stmt = pg_insert(rollup).from_select(
+        ["report_date", "retail_partner_id", "product_id", "quantity", "gross_value", "net_value"],
+        _aggregate(sign).where(report.id.in_(report_ids)),
+    )
+    upsert = stmt.on_conflict_do_update(
+        index_elements=[rollup.c.report_date, rollup.c.retail_partner_id, rollup.c.product_id],
+        set_={
+            "quantity": rollup.c.quantity + stmt.excluded.quantity,
+            "gross_value": rollup.c.gross_value + stmt.excluded.gross_value,
+            "net_value": rollup.c.net_value + stmt.excluded.net_value,
+        },
+    )
+    emptied = delete(rollup).where(
+        tuple_(rollup.c.report_date, rollup.c.retail_partner_id).in_(
+            select(report.report_date, report.retail_partner_id).where(report.id.in_(report_ids))
+        ),
+        rollup.c.quantity == 0,
+        rollup.c.gross_value == 0,
+        rollup.c.net_value == 0,
+    )
+    return [upsert, emptied]
+
+
+def apply_reports(db: Session, report_ids: Iterable[int], sign: int = 1) -> bool:
+    """
+    Adds (`sign=1`) or removes (`sign=-1`) the items of the given reports to or
+    from the rollup and returns whether there was anything to apply. Does not
+    commit.
+    """
+    report_ids = list(report_ids)
+    if not report_ids:
+        return False
+    for stmt in apply_statements(report_ids, sign):
+        db.execute(stmt)
+    return True
+
+
+def apply_status_change(db: Session, report_id: int, old_status: Optional[str], new_status: Optional[str]) -> bool:
+    """
+    Updates the rollup for a report whose status changed and returns whether the
+    report started or stopped counting. Does not commit.
+    """
+    if counts(old_status) == counts(new_status):
+        return False
+    return apply_reports(db, [report_id], sign=1 if counts(new_status) else -1)
+
+
+def rebuild(db: Session, start_date: Optional[date] = None, end_date: Optional[date] = None) -> int:
+    """
+    Recomputes the rollup for a date range (all dates by default) from the raw
+    sales items and returns the number of rollup rows written. Archived months
+    have no raw items left and keep their rollup rows. Does not commit.
+
+    Concurrent writers are held off until the caller commits, so no status
+    change is both recomputed here and applied by its writer.
+    """
+    rollup = models.DailySalesRollup
+    report = models.DailySalesReport
+    item = models.DailySalesItem
+    clear = delete(rollup)
+    gross, net = line_values()
+    source = _aggregate().where(report.status.in_(ROLLUP_STATUSES)).having(
+        (func.sum(item.quantity_sold) != 0) | (func.sum(gross) != 0) | (func.sum(net) != 0)
+    )
+    if start_date is not None:
+        clear = clear.where(rollup.report_date >= start_date)
+        source = source.where(report.report_date >= start_date, item.report_date >= start_date)
+    if end_date is not None:
+        clear = clear.where(rollup.report_date <= end_date)
+        source = source.where(report.report_date <= end_date, item.report_date <= end_date)
+    for month in archive.months_between(start_date, end_date):
+        clear = clear.where(~rollup.report_date.between(month, partitions.add_months(month, 1) - timedelta(days=1)))
+    if db.get_bind().dialect.name == "postgresql":
+        # Conflicts with writers' upserts: waits for those in flight, blocks new ones
+        db.execute(text(f"LOCK TABLE {rollup.__tablename__} IN SHARE ROW EXCLUSIVE MODE"))
+    db.execute(clear)
+    result = db.execute(insert(rollup.__table__).from_select(
+        ["report_date", "retail_partner_id", "product_id", "quantity", "gross_value", "net_value"], source
+    ))
+    return result.rowcount
@@ -2,6 +2,7 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 import os
 from dotenv import load_dotenv
+from db.pool_metrics import TimedQueuePool, instrument
 load_dotenv()
 
 DATABASE_URL = (
@@ -9,5 +10,18 @@ DATABASE_URL = (
     f"@{os.getenv('POSTGRES_SERVER')}:{os.getenv('POSTGRES_PORT')}/{os.getenv('POSTGRES_DB')}"
 )
 
-engine = create_engine(DATABASE_URL,)
+# Serve the /sales routes from the asyncpg engine instead of the threadpool (see db/async_session.py)
+USE_ASYNC_DB = os.getenv("DB_ASYNC", "false").lower() in ("1", "true", "yes")
+
+# Connection pool settings, shared by the sync and async engines
+POOL_OPTIONS = {
+    "pool_size": int(os.getenv("DB_POOL_SIZE", "5")),
+    "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", "10")),
+    "pool_timeout": float(os.getenv("DB_POOL_TIMEOUT", "30")),
+    "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", "1800")),
+    "pool_pre_ping": os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes"),
+}
+
+engine = create_engine(DATABASE_URL, poolclass=TimedQueuePool, **POOL_OPTIONS)
+instrument("sync", engine)
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
\ No newline at end of file
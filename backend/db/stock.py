@@ -0,0 +1,68 @@
+"""
+Inventory stock movements driven by sales reports.
+
+When a report becomes approved its items are taken out of the store's
+inventory, and put back if it later leaves the approved state. Each movement is
+one set-based UPDATE: sold quantities are summed per (store, product) from the
+report items in the database, the matching inventory rows are locked in id
+order (so concurrent approvals touching the same store queue instead of
+deadlocking), and all of them are updated together.
+"""
+from typing import Iterable, List, Optional
+
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session
+
+import models
+
+STOCK_STATUSES = ('approved',)
+
+
+def counts(status: Optional[str]) -> bool:
+    """Whether a report with this status has been taken out of inventory."""
+    return status in STOCK_STATUSES
+
+
+def apply_statement(report_ids: List[int], sign: int = -1):
+    """The UPDATE behind `apply_reports`, for callers that execute it themselves."""
+    report = models.DailySalesReport
+    item = models.DailySalesItem
+    inventory = models.Inventory
+
+    sold = select(
+        report.retail_partner_id, item.product_id, func.sum(item.quantity_sold).label("quantity")
+    ).join(report, (report.id == item.report_id) & (report.report_date == item.report_date)).where(
+        report.id.in_(report_ids)
+    ).group_by(report.retail_partner_id, item.product_id).cte("sold")
+
+    locked = select(inventory.id, sold.c.quantity).join(
+        sold, (inventory.retail_partner_id == sold.c.retail_partner_id) & (inventory.product_id == sold.c.product_id)
+    ).order_by(inventory.id).with_for_update(of=inventory).cte("locked")
+
+    return (
+        update(inventory.__table__)
+        .where(inventory.__table__.c.id == locked.c.id)
+        .values(
+            quantity=inventory.__table__.c.quantity + sign * locked.c.quantity,
+            last_updated=func.now(),
+        )
+    )
+
+
+def apply_reports(db: Session, report_ids: Iterable[int], sign: int = -1) -> int:
+    """
+    Decrements (`sign=-1`) or restores (`sign=1`) inventory for the items of the
+    given reports and returns the number of inventory rows changed. Products a
+    store has no inventory row for are skipped. Does not commit.
+    """
+    report_ids = list(report_ids)
+    if not report_ids:
+        return 0
+    return db.execute(apply_statement(report_ids, sign)).rowcount
+
+
+def apply_status_change(db: Session, report_id: int, old_status: Optional[str], new_status: Optional[str]) -> None:
+    """Moves stock for a report whose status changed. Does not commit."""
+    if counts(old_status) == counts(new_status):
+        return
+    apply_reports(db, [report_id], sign=-1 if counts(new_status) else 1)
@@ -1,12 +1,18 @@
 from fastapi import FastAPI
+from fastapi.datastructures import Default
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse
 import auth.auth_api
-from api import api,sales_api,daily
+from api import api,sales_api,daily,internal,metrics,fast_json
+from db import query_metrics
+from db.session import USE_ASYNC_DB
 
 app = FastAPI(
     title="Daily Sales API",
     description="A FastAPI application for daily sales management, including user authentication.",
-    version="0.1.0"
+    version="0.1.0",
+    # JSON_RESPONSE_CLASS=orjson swaps the app-wide JSON encoder (see api/fast_json.py)
+    default_response_class=fast_json.default_response_class() or Default(JSONResponse),
 )
 
 # CORS origins: Add your frontend URLs here
@@ -22,13 +28,29 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],              # Allow all HTTP methods (GET, POST, etc.)
     allow_headers=["*"],              # Allow all headers
+    expose_headers=["X-Next-Cursor", "ETag"], # Pagination cursor, inventory ETags
 )
 
+# Per-route latency, DB time and query count histograms, scraped from /metrics;
+# with QUERY_DEBUG also per-response query count headers and N+1 warnings
+if metrics.METRICS_ENABLED or query_metrics.QUERY_DEBUG:
+    app.add_middleware(metrics.MetricsMiddleware)
+
+if metrics.METRICS_ENABLED:
+    @app.get("/metrics", include_in_schema=False)
+    def get_metrics():
+        return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
 # Include routers
 app.include_router(auth.auth_api.router)
 app.include_router(api.router)    
-app.include_router(sales_api.router)
+if USE_ASYNC_DB:
+    from api import sales_api_async
+    app.include_router(sales_api_async.router)
+else:
+    app.include_router(sales_api.router)
 app.include_router(daily.router)
+app.include_router(internal.router)
 
 # Root route
 @app.get("/")
@@ -1,7 +1,7 @@
 from db.base import Base
 from sqlalchemy import (
     Column, Integer, String, Text, Date, ForeignKey, Numeric, DateTime,
-    CheckConstraint, UniqueConstraint
+    CheckConstraint, UniqueConstraint, Index, ForeignKeyConstraint, DDL, event
 )
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -9,8 +9,10 @@ from datetime import datetime
 class DailySalesItem(Base):
     __tablename__ = "daily_sales_items"
 
-    id = Column(Integer, primary_key=True)
-    report_id = Column(Integer, ForeignKey("daily_sales_report.id"), nullable=False)
+    # Partitioned like daily_sales_report; report_date is copied from the report
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    report_id = Column(Integer, nullable=False)
+    report_date = Column(Date, primary_key=True, nullable=False)
     product_id = Column(Integer, ForeignKey("products.id"), nullable=False)
     quantity_sold = Column(Integer, nullable=False)
     unit_price = Column(Numeric(10, 2), nullable=False)         # Final sold price (after discount)
@@ -19,6 +21,22 @@ class DailySalesItem(Base):
     report = relationship("DailySalesReport", back_populates="sales_items")
     product = relationship("Product", back_populates="sales_items")
 
+    __table_args__ = (
+        ForeignKeyConstraint(
+            ["report_id", "report_date"], ["daily_sales_report.id", "daily_sales_report.report_date"],
+            name="daily_sales_items_report_fkey",
+        ),
+        Index("ix_daily_sales_items_report_id", "report_id"),
+        Index("ix_daily_sales_items_product_id", "product_id"),
+        {"postgresql_partition_by": "RANGE (report_date)"},
+    )
+    __mapper_args__ = {"primary_key": [id]}
+
     @property
     def total_price(self):
-        return float(self.quantity_sold) * float(self.unit_price)
\ No newline at end of file
+        return float(self.quantity_sold) * float(self.unit_price)
+
+event.listen(
+    DailySalesItem.__table__, "after_create",
+    DDL("CREATE TABLE daily_sales_items_default PARTITION OF daily_sales_items DEFAULT").execute_if(dialect="postgresql"),
+)
@@ -1,7 +1,7 @@
 from db.base import Base
 from sqlalchemy import (
     Column, Integer, String, Text, Date, ForeignKey, Numeric, DateTime,
-    CheckConstraint, UniqueConstraint
+    CheckConstraint, UniqueConstraint, Index, DDL, event, text
 )
 from sqlalchemy.orm import relationship
 from datetime import datetime, timezone
@@ -9,10 +9,11 @@ from datetime import datetime, timezone
 class DailySalesReport(Base):
     __tablename__ = "daily_sales_report"
 
-    id = Column(Integer, primary_key=True)
+    # Partitioned by month of report_date, which must therefore be part of the primary key
+    id = Column(Integer, primary_key=True, autoincrement=True)
     merchandiser_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     retail_partner_id = Column(Integer, ForeignKey("retail_partners.id"), nullable=False)
-    report_date = Column(Date, nullable=False)
+    report_date = Column(Date, primary_key=True, nullable=False)
     status = Column(String(50), default="submitted")
     notes = Column(Text)
     submitted_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
@@ -24,4 +25,22 @@ class DailySalesReport(Base):
     __table_args__ = (
         UniqueConstraint("merchandiser_id", "report_date", name="uix_merch_report_date"),
         CheckConstraint("status IN ('submitted', 'pending', 'approved', 'rejected')"),
-    )
\ No newline at end of file
+        # Listing order (report_date desc, id desc); merchandiser filters use uix_merch_report_date
+        Index("ix_daily_sales_report_date_id", "report_date", "id"),
+        Index("ix_daily_sales_report_partner_date_id", "retail_partner_id", "report_date", "id"),
+        Index("ix_daily_sales_report_status_date_id", "status", "report_date", "id"),
+        # Approval queue
+        Index(
+            "ix_daily_sales_report_pending_date_id", "report_date", "id",
+            postgresql_where=text("status = 'pending'"),
+        ),
+        {"postgresql_partition_by": "RANGE (report_date)"},
+    )
+    # ids are unique on their own (one sequence), so the ORM identifies reports by id alone
+    __mapper_args__ = {"primary_key": [id]}
+
+# Catch-all partition so inserts never fail; db/partitions.py creates the monthly ones
+event.listen(
+    DailySalesReport.__table__, "after_create",
+    DDL("CREATE TABLE daily_sales_report_default PARTITION OF daily_sales_report DEFAULT").execute_if(dialect="postgresql"),
+)
\ No newline at end of file
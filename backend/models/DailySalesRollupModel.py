@@ -0,0 +1,18 @@
+from db.base import Base
+from sqlalchemy import (
+    Column, Integer, String, Text, Date, ForeignKey, Numeric, DateTime,
+    CheckConstraint, UniqueConstraint
+)
+from sqlalchemy.orm import relationship
+from datetime import datetime, timezone
+
+class DailySalesRollup(Base):
+    __tablename__ = "daily_sales_rollup"
+
+    # Totals of sales items from counted reports (see db.rollup.ROLLUP_STATUSES)
+    report_date = Column(Date, primary_key=True)
+    retail_partner_id = Column(Integer, ForeignKey("retail_partners.id"), primary_key=True)
+    product_id = Column(Integer, ForeignKey("products.id"), primary_key=True)
+    quantity = Column(Integer, nullable=False, default=0)
+    gross_value = Column(Numeric(14, 2), nullable=False, default=0)   # quantity * sold price
+    net_value = Column(Numeric(14, 2), nullable=False, default=0)     # after discount
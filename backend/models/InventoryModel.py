@@ -14,7 +14,7 @@ class Inventory(Base):
     product_id = Column(Integer, ForeignKey("products.id"), nullable=False)
     quantity = Column(Integer, nullable=False, default=0)
     unit_selling_price = Column(Numeric(10, 2), nullable=False)  # Price offered at this partner
-    last_updated = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
+    last_updated = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
 
     retail_partner = relationship("RetailPartner", back_populates="inventory")
     product = relationship("Product", back_populates="inventory")
@@ -1,6 +1,7 @@
 from .AuditLogsModel import AuditLog
 from .DailySalesItemModel import DailySalesItem
 from .DailySalesReportModel import DailySalesReport
+from .DailySalesRollupModel import DailySalesRollup
 from .InventoryModel import Inventory
 from .RetailModel import RetailPartner
 from .ProductModel import Product
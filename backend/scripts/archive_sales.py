@@ -0,0 +1,50 @@
+"""
+Moves closed months of sales out of Postgres into the Parquet archive.
+
+Usage (from backend/):
+    python -m scripts.archive_sales [--month YYYY-MM ...] [--dry-run]
+
+Without --month, archives every month that ended more than
+SALES_ARCHIVE_AFTER_DAYS days ago and has no reports awaiting review. Requires
+pyarrow.
+"""
+import argparse
+import sys
+from datetime import datetime
+
+from db import archive
+from db.session import SessionLocal
+
+
+def _month(value: str):
+    return datetime.strptime(value, "%Y-%m").date()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--month", type=_month, action="append", help="month to archive (repeatable)")
+    parser.add_argument("--dry-run", action="store_true", help="only list the months that would be archived")
+    args = parser.parse_args(argv)
+
+    failed = False
+    with SessionLocal() as db:
+        months = sorted(args.month) if args.month else archive.closed_months(db)
+        if not months:
+            print("Nothing to archive")
+            return 0
+        for month in months:
+            if args.dry_run:
+                print(f"Would archive {month:%Y-%m}")
+                continue
+            try:
+                reports, items = archive.archive_month(db, month)
+            except ValueError as e:
+                print(f"Skipped {month:%Y-%m}: {e}", file=sys.stderr)
+                failed = True
+                continue
+            print(f"Archived {month:%Y-%m}: {reports} reports, {items} items -> {archive.month_dir(month)}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
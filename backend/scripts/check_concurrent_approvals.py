@@ -0,0 +1,111 @@
+"""
+Concurrency check for inventory decrements on report approval.
+
+Creates a throwaway store with a few products, submits `--reports` reports that
+sell overlapping products in shuffled order, approves them all in parallel
+(some twice, to race duplicate approvals), and verifies that each inventory row
+was decremented exactly once per approved report with no deadlocks or lost
+updates. Everything it creates is removed afterwards.
+
+Usage (from backend/, against a disposable database):
+    python -m scripts.check_concurrent_approvals [--reports 40] [--threads 16]
+"""
+import argparse
+import random
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+
+from sqlalchemy import delete
+
+import models
+from api.sales_api import UpdateReportStatusRequest, update_sales_report_status
+from db.session import SessionLocal
+
+START_QUANTITY = 1_000_000
+
+
+def _setup(report_count: int, product_count: int = 6):
+    with SessionLocal() as db:
+        partner = models.RetailPartner(name="concurrency-check", location="-")
+        db.add(partner)
+        db.flush()
+        products = [
+            models.Product(name=f"concurrency-check-{i}", category="check", unit_cost_price=1, unit_price=1)
+            for i in range(product_count)
+        ]
+        db.add_all(products)
+        db.flush()
+        for product in products:
+            db.add(models.Inventory(retail_partner_id=partner.id, product_id=product.id, quantity=START_QUANTITY, unit_selling_price=1))
+        merchandiser = models.User(name="concurrency-check", password_hash="-", role="merchandiser", retail_partner_id=partner.id)
+        db.add(merchandiser)
+        db.flush()
+
+        expected = {product.id: START_QUANTITY for product in products}
+        report_ids = []
+        for n in range(report_count):
+            report = models.DailySalesReport(
+                merchandiser_id=merchandiser.id, retail_partner_id=partner.id,
+                report_date=date(2000, 1, 1) + timedelta(days=n), status="submitted",
+            )
+            chosen = random.sample(products, k=random.randint(2, product_count))
+            for product in chosen:
+                quantity = random.randint(1, 5)
+                report.sales_items.append(models.DailySalesItem(product_id=product.id, quantity_sold=quantity, unit_price=1, discount_percent=0))
+                expected[product.id] -= quantity
+            db.add(report)
+            db.flush()
+            report_ids.append(report.id)
+        db.commit()
+        return partner.id, merchandiser.id, [p.id for p in products], report_ids, expected
+
+
+def _approve(report_id: int):
+    with SessionLocal() as db:
+        update_sales_report_status(report_id, UpdateReportStatusRequest(status="approved"), db=db)
+
+
+def _cleanup(partner_id: int, merchandiser_id: int, product_ids):
+    with SessionLocal() as db:
+        report_ids = [r for (r,) in db.query(models.DailySalesReport.id).filter(models.DailySalesReport.merchandiser_id == merchandiser_id)]
+        db.execute(delete(models.DailySalesItem).where(models.DailySalesItem.report_id.in_(report_ids)))
+        db.execute(delete(models.DailySalesReport).where(models.DailySalesReport.id.in_(report_ids)))
+        db.execute(delete(models.DailySalesRollup).where(models.DailySalesRollup.retail_partner_id == partner_id))
+        db.execute(delete(models.Inventory).where(models.Inventory.retail_partner_id == partner_id))
+        db.execute(delete(models.User).where(models.User.id == merchandiser_id))
+        db.execute(delete(models.Product).where(models.Product.id.in_(product_ids)))
+        db.execute(delete(models.RetailPartner).where(models.RetailPartner.id == partner_id))
+        db.commit()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Concurrency check for inventory decrements on report approval.")
+    parser.add_argument("--reports", type=int, default=40)
+    parser.add_argument("--threads", type=int, default=16)
+    args = parser.parse_args(argv)
+
+    partner_id, merchandiser_id, product_ids, report_ids, expected = _setup(args.reports)
+    try:
+        # Every report once, a quarter of them twice, in random order
+        jobs = report_ids + random.sample(report_ids, k=len(report_ids) // 4)
+        random.shuffle(jobs)
+        with ThreadPoolExecutor(max_workers=args.threads) as pool:
+            list(pool.map(_approve, jobs))
+
+        with SessionLocal() as db:
+            actual = dict(db.query(models.Inventory.product_id, models.Inventory.quantity).filter(
+                models.Inventory.retail_partner_id == partner_id
+            ).all())
+        mismatches = {pid: (expected[pid], actual.get(pid)) for pid in expected if actual.get(pid) != expected[pid]}
+        if mismatches:
+            print(f"FAIL  inventory mismatch (expected, actual): {mismatches}")
+            return 1
+        print(f"ok    {len(jobs)} parallel approvals over {len(report_ids)} reports, inventory consistent")
+        return 0
+    finally:
+        _cleanup(partner_id, merchandiser_id, product_ids)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,33 @@
+"""
+Creates the upcoming monthly partitions of the sales tables.
+
+Usage (from backend/):
+    python -m scripts.create_partitions [--months-ahead N] [--start YYYY-MM-DD]
+"""
+import argparse
+import sys
+from datetime import date
+
+from db import partitions
+from db.session import SessionLocal
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--months-ahead", type=int, default=partitions.PARTITIONS_AHEAD,
+                        help="months after the start month to create partitions for")
+    parser.add_argument("--start", type=date.fromisoformat, default=None, help="first month to cover (default: today)")
+    args = parser.parse_args(argv)
+
+    with SessionLocal() as db:
+        created = partitions.ensure_partitions(db, args.months_ahead, args.start)
+        db.commit()
+    if created:
+        print("Created partitions for", ", ".join(f"{month:%Y-%m}" for month in created))
+    else:
+        print("All partitions already exist")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,79 @@
+"""
+Checks that the hot sales queries are served by an index.
+
+Runs EXPLAIN (FORMAT JSON) for each query shape issued by /sales/daily-sales-reports
+and its eager loads, and fails if any plan has no index scan. Sequential scans are
+disabled for the check so the result doesn't depend on how much data is loaded.
+
+Usage (from backend/):
+    python -m scripts.explain_indexes
+"""
+import json
+import sys
+
+from sqlalchemy import text
+
+from db.session import engine
+
+HOT_QUERIES = {
+    "reports: default listing": (
+        "SELECT id FROM daily_sales_report "
+        "ORDER BY report_date DESC, id DESC LIMIT 101"
+    ),
+    "reports: keyset page": (
+        "SELECT id FROM daily_sales_report WHERE (report_date, id) < ('2025-06-01', 1000) "
+        "ORDER BY report_date DESC, id DESC LIMIT 101"
+    ),
+    "reports: by retail partner": (
+        "SELECT id FROM daily_sales_report WHERE retail_partner_id = 1 "
+        "ORDER BY report_date DESC, id DESC LIMIT 101"
+    ),
+    "reports: by merchandiser": (
+        "SELECT id FROM daily_sales_report WHERE merchandiser_id = 1 "
+        "ORDER BY report_date DESC, id DESC LIMIT 101"
+    ),
+    "reports: by status": (
+        "SELECT id FROM daily_sales_report WHERE status = 'submitted' "
+        "ORDER BY report_date DESC, id DESC LIMIT 101"
+    ),
+    "reports: pending approval queue": (
+        "SELECT id FROM daily_sales_report WHERE status = 'pending' "
+        "ORDER BY report_date DESC, id DESC LIMIT 101"
+    ),
+    "reports: by date": (
+        "SELECT id FROM daily_sales_report WHERE report_date = '2025-06-01'"
+    ),
+    "items: selectinload by report": (
+        "SELECT id FROM daily_sales_items WHERE report_id IN (1, 2, 3)"
+    ),
+}
+
+INDEX_NODES = {"Index Scan", "Index Only Scan", "Bitmap Index Scan"}
+
+
+def _index_names(plan: dict) -> list:
+    """Returns the indexes used anywhere in a plan tree."""
+    names = [plan["Index Name"]] if plan.get("Node Type") in INDEX_NODES else []
+    for child in plan.get("Plans", []):
+        names.extend(_index_names(child))
+    return names
+
+
+def main() -> int:
+    failures = 0
+    with engine.connect() as conn:
+        conn.execute(text("SET enable_seqscan = off"))
+        for label, sql in HOT_QUERIES.items():
+            raw = conn.execute(text(f"EXPLAIN (FORMAT JSON) {sql}")).scalar_one()
+            plan = (json.loads(raw) if isinstance(raw, str) else raw)[0]["Plan"]
+            indexes = _index_names(plan)
+            if indexes:
+                print(f"ok    {label}: {', '.join(indexes)}")
+            else:
+                failures += 1
+                print(f"FAIL  {label}: no index scan ({plan['Node Type']})")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,33 @@
+"""
+Rebuilds the daily_sales_rollup table from raw sales items.
+
+Usage (from backend/):
+    python -m scripts.rebuild_rollup [--start YYYY-MM-DD] [--end YYYY-MM-DD]
+"""
+import argparse
+import sys
+from datetime import date
+
+from api import catalog_cache
+from db import rollup
+from db.session import SessionLocal
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--start", type=date.fromisoformat, default=None, help="first report_date to rebuild")
+    parser.add_argument("--end", type=date.fromisoformat, default=None, help="last report_date to rebuild")
+    args = parser.parse_args(argv)
+
+    with SessionLocal() as db:
+        written = rollup.rebuild(db, args.start, args.end)
+        db.commit()
+    # Reaches running workers only through a shared (Redis) cache;
+    # their in-memory leaderboards expire after CATALOG_CACHE_TTL
+    catalog_cache.invalidate(catalog_cache.LEADERBOARDS)
+    print(f"Rebuilt daily_sales_rollup: {written} rows")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())